@@ -0,0 +1,233 @@
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from logger import DataLogger, LogCursor
+from series import Series
+
+# ASTM D648-style defaults
+HDT_DEFLECTION_MM = 0.25
+TARGET_RATE_C_PER_MIN = 2.0
+RATE_TOLERANCE_C_PER_MIN = 0.2
+RATE_WINDOW_S = 60.0
+
+TEMP_TYPES = ("temperature",)
+DIAL_TYPES = ("dial", "dial_indicator")
+
+
+class _SampleState:
+	def __init__(self):
+		self.dial = Series()
+		self.temp = Series()
+		self.rate = Series()
+		self.dial_done = 0       # dial points already scanned for the threshold
+		self.rate_done = 0       # temp points already turned into a heating rate
+		self.hdt_time: Optional[float] = None
+		self.hdt_temp: Optional[float] = None
+		self.deviations: List[Dict[str, float]] = []
+		self.in_deviation = False
+
+
+class HDTAnalyzer:
+	def __init__(
+		self,
+		logger: DataLogger,
+		to_epoch,
+		threshold_mm: float = HDT_DEFLECTION_MM,
+		target_rate: float = TARGET_RATE_C_PER_MIN,
+		rate_tolerance: float = RATE_TOLERANCE_C_PER_MIN,
+		rate_window_s: float = RATE_WINDOW_S,
+	):
+		"""
+		Incremental HDT analysis over the logged run.
+
+		Dial and temperature rows are grouped per sample (via the row's
+		integer sample_id) into columnar buffers. Each update only processes the
+		rows logged since the previous one.
+
+		:param logger: DataLogger whose run is analysed
+		:param to_epoch: Callable normalizing a row timestamp to epoch seconds (or None)
+		:param threshold_mm: Deflection that defines the HDT point
+		:param target_rate: Nominal heating rate in °C/min
+		:param rate_tolerance: Allowed deviation from target_rate in °C/min
+		:param rate_window_s: Window used for the rolling heating rate
+		"""
+		self.cursor = LogCursor(logger)
+		self.to_epoch = to_epoch
+		self.threshold_mm = threshold_mm
+		self.target_rate = target_rate
+		self.rate_tolerance = rate_tolerance
+		self.rate_window_s = rate_window_s
+		self.samples: Dict[int, _SampleState] = {}
+		self._lock = threading.Lock()
+
+	# ---------- ingestion ----------
+	def update(self):
+		"""Pull rows logged since the last call and advance every touched sample."""
+		with self._lock:
+			reset, rows = self.cursor.new_rows()
+			if reset:
+				self.samples.clear()
+			if not rows:
+				return
+
+			config = self.cursor.logger.config
+			# sample_id -> kind -> ([t], [v])
+			grouped: Dict[int, Dict[str, tuple]] = {}
+			for row in rows:
+				sample_id = row.get("sample_id")
+				if sample_id is None:
+					sample_id = config.intern_sample(row.get("sample_name") or "")
+				if not sample_id:
+					continue
+				stype = row.get("sensor_type", "")
+				if stype in TEMP_TYPES:
+					kind = "temp"
+				elif stype in DIAL_TYPES:
+					kind = "dial"
+				else:
+					continue
+				ts = self.to_epoch(row.get("timestamp"))
+				if kind == "temp" and "filtered_value" in row:
+					# filtered channel from the engine; None means the reading was rejected
+					val = row["filtered_value"]
+				else:
+					val = row.get("sensor_value", row.get("value"))
+				if ts is None or val is None:
+					continue
+				try:
+					val = float(val)
+				except (TypeError, ValueError):
+					continue
+				cols = grouped.setdefault(sample_id, {}).setdefault(kind, ([], []))
+				cols[0].append(ts)
+				cols[1].append(val)
+
+			for sample_id, kinds in grouped.items():
+				state = self.samples.setdefault(sample_id, _SampleState())
+				for kind, (t, v) in kinds.items():
+					series = state.dial if kind == "dial" else state.temp
+					if series.extend(np.asarray(t), np.asarray(v)):
+						# late rows: recompute this stream from scratch
+						if kind == "dial":
+							state.dial_done = 0
+							state.hdt_time = state.hdt_temp = None
+						else:
+							state.rate = Series()
+							state.rate_done = 0
+							state.deviations = []
+							state.in_deviation = False
+							state.hdt_temp = None
+				self._advance_threshold(state)
+				self._advance_rate(state)
+
+	def _advance_threshold(self, state: _SampleState):
+		dial = state.dial
+		if state.hdt_time is None and dial.n >= 2:
+			d = np.abs(dial.v - dial.v[0])
+			start = max(state.dial_done, 1)
+			hits = np.flatnonzero(d[start:] >= self.threshold_mm)
+			if hits.size:
+				i = start + hits[0]
+				d0, d1 = d[i - 1], d[i]
+				frac = (self.threshold_mm - d0) / (d1 - d0) if d1 != d0 else 1.0
+				state.hdt_time = float(dial.t[i - 1] + frac * (dial.t[i] - dial.t[i - 1]))
+			state.dial_done = dial.n
+
+		# Temperature at the crossing, once the temp stream covers that instant
+		temp = state.temp
+		if state.hdt_time is not None and state.hdt_temp is None and temp.n:
+			if temp.t[0] <= state.hdt_time <= temp.t[-1]:
+				state.hdt_temp = float(np.interp(state.hdt_time, temp.t, temp.v))
+
+	def _advance_rate(self, state: _SampleState):
+		temp = state.temp
+		if temp.n == state.rate_done:
+			return
+		t, v = temp.t, temp.v
+		start = state.rate_done
+		state.rate_done = temp.n
+		valid = t[start:] - self.rate_window_s >= t[0]
+		if not valid.any():
+			return
+
+		tj = t[start:][valid]
+		vj = v[start:][valid]
+		past = np.interp(tj - self.rate_window_s, t, v)
+		rate = (vj - past) * 60.0 / self.rate_window_s
+		state.rate.extend(tj, rate)
+
+		# Merge consecutive out-of-tolerance points into deviation intervals
+		err = rate - self.target_rate
+		bad = np.abs(err) > self.rate_tolerance
+		edges = np.flatnonzero(np.diff(bad.astype(np.int8))) + 1
+		bounds = np.concatenate(([0], edges, [len(bad)]))
+		for a, b in zip(bounds[:-1], bounds[1:]):
+			if not bad[a]:
+				state.in_deviation = False
+				continue
+			worst = float(err[a:b][np.argmax(np.abs(err[a:b]))])
+			if state.in_deviation and state.deviations:
+				dev = state.deviations[-1]
+				dev["end"] = float(tj[b - 1])
+				if abs(worst) > abs(dev["max_error"]):
+					dev["max_error"] = worst
+			else:
+				state.deviations.append({
+					"start": float(tj[a]),
+					"end": float(tj[b - 1]),
+					"max_error": worst,
+				})
+			state.in_deviation = True
+
+	# ---------- reporting ----------
+	def _sample_summary(self, name: str) -> Dict[str, object]:
+		state = self.samples.get(self.cursor.logger.config.sample_id_for(name))
+		out: Dict[str, object] = {
+			"sample_name": name,
+			"baseline_mm": None,
+			"deflection_mm": None,
+			"hdt_reached": False,
+			"hdt_time": None,
+			"hdt_temp_c": None,
+			"temperature_c": None,
+			"heating_rate_c_per_min": None,
+			"rate_ok": None,
+			"rate_deviations": [],
+		}
+		if state is None:
+			return out
+		if state.dial.n:
+			out["baseline_mm"] = float(state.dial.v[0])
+			out["deflection_mm"] = float(abs(state.dial.v[-1] - state.dial.v[0]))
+		if state.temp.n:
+			out["temperature_c"] = float(state.temp.v[-1])
+		if state.rate.n:
+			rate = float(state.rate.v[-1])
+			out["heating_rate_c_per_min"] = rate
+			out["rate_ok"] = abs(rate - self.target_rate) <= self.rate_tolerance
+		out["hdt_reached"] = state.hdt_time is not None
+		out["hdt_time"] = state.hdt_time
+		out["hdt_temp_c"] = state.hdt_temp
+		out["rate_deviations"] = [dict(d) for d in state.deviations]
+		return out
+
+	def summary(self, active_samples: Dict[str, str]) -> Dict[str, object]:
+		"""
+		Analysis results keyed by station slot (sensor_config.active_samples()),
+		falling back to every sample seen in the run when no slot is assigned.
+		"""
+		with self._lock:
+			slots = {slot: name for slot, name in active_samples.items() if name}
+			if not slots:
+				config = self.cursor.logger.config
+				names = (config.sample_name_for(i) for i in self.samples)
+				slots = {name: name for name in names}
+			return {
+				"threshold_mm": self.threshold_mm,
+				"target_rate_c_per_min": self.target_rate,
+				"rate_tolerance_c_per_min": self.rate_tolerance,
+				"rate_window_s": self.rate_window_s,
+				"samples": {slot: self._sample_summary(name) for slot, name in slots.items()},
+			}
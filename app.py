@@ -1,22 +1,24 @@
-from flask import Flask, jsonify, render_template, send_file, request, Response
+from flask import Flask, jsonify, render_template, send_file, request
 from data_engine import DataEngine
 from sensor_config import sensor_config
 from manual_logger import append_rows
+from run_exporter import RunExporter
+from analysis import HDTAnalyzer
+from hub import FixtureHub, load_fixtures
+from replay import CsvReplaySource
+from importer import import_into
+from chart_data import SeriesIndex, chart_window
+from fast_json import FragmentCache, columnar_history, dumps, json_array_stream, json_response
+from history_store import ITER_CHUNK
 import os
-import io
-import csv
 import json
 from datetime import datetime, timezone
 
 # ===== Config =====
 CSV_LOG_PATH = os.getenv("CSV_LOG_PATH", os.path.join("exports", "data_log.csv"))
 
-TEMP1_ID = "28-000008ae0bbd"
-TEMP2_ID = "28-000008ae5436"
-DIAL1_MANUAL_ID = "dial_1_manual_entry"
-DIAL2_MANUAL_ID = "dial_2_manual_entry"
-
-ACTIVE_SAMPLES = {"sample1": "", "sample2": ""}
+# Station slots (sample1, sample2, ...) and their sensors come from config/stations.json
+# (see sensor_config.DEFAULT_STATIONS)
 
 THEME_PATH = os.path.join("config", "theme.json")
 DEFAULT_THEME = {
@@ -24,10 +26,24 @@ DEFAULT_THEME = {
 	"colorB": "#2E86FF"   # Sofar light blue
 }
 
+# Replay mode: feed a recorded CSV through the engine instead of live sensors
+REPLAY_CSV = os.getenv("REPLAY_CSV", "")
+REPLAY_SPEED = os.getenv("REPLAY_SPEED", "1")   # playback factor, or "max"
+
 app = Flask(__name__)
-engine = DataEngine()
+if REPLAY_CSV:
+	speed = 0.0 if REPLAY_SPEED.lower() == "max" else float(REPLAY_SPEED)
+	engine = DataEngine(source=CsvReplaySource(REPLAY_CSV, speed=speed))
+else:
+	engine = DataEngine()
 engine.start()
 
+# Hub mode: aggregate other fixtures' dashboards (HUB_FIXTURES / config/hub.json)
+HUB_FIXTURES = load_fixtures()
+hub = FixtureHub(HUB_FIXTURES) if HUB_FIXTURES else None
+if hub is not None:
+	hub.start()
+
 
 def _ensure_dir(p):
 	os.makedirs(os.path.dirname(os.path.abspath(p)), exist_ok=True)
@@ -108,24 +124,31 @@ def _to_epoch(ts):
 	return None
 
 
+exporter = RunExporter(engine.logger, _to_epoch)
+analyzer = HDTAnalyzer(engine.logger, _to_epoch)
+chart_index = SeriesIndex(engine.logger)
+fragments = FragmentCache()
+
+
 @app.get("/api/data")
 def api_data():
+	if hub is not None:
+		return jsonify(hub.get_latest_data())
+
+	health = engine.get_sensor_health()
 	# Start with the engine's view
 	latest = engine.get_latest_data()  # {sensor_id: {"timestamp": epoch(float), "sensor_value": x}}
-	# Merge in newest values from the in-memory log (manual entries, etc.)
-	seen = set()
-	for row in reversed(engine.logger.data):
-		sid = row.get("sensor_id")
-		if not sid or sid in seen:
-			continue
-		ts_epoch = _to_epoch(row.get("timestamp"))
-		val = row.get("sensor_value")
-		# Accept either 'sensor_value' or legacy 'value'
-		if val is None:
-			val = row.get("value")
-		if ts_epoch is not None and val is not None:
-			latest[sid] = {"timestamp": ts_epoch, "sensor_value": val}
-			seen.add(sid)
+	# Merge in newest values from the run history (manual entries, etc.);
+	# a quarantined probe's last logged row is stale, so it isn't served
+	for sid, row in engine.logger.latest_rows().items():
+		if row["sensor_value"] is not None and health.get(sid, {}).get("state") != "quarantined":
+			latest[sid] = {"timestamp": row["timestamp"], "sensor_value": row["sensor_value"],
+						   "filtered_value": row["filtered_value"]}
+	# Probes without a current reading still get an entry carrying their health
+	for sid, h in health.items():
+		if sid not in latest:
+			ts = h.get("last_good") or datetime.now(timezone.utc).timestamp()
+			latest[sid] = {"timestamp": ts, "sensor_value": None, "filtered_value": None}
 
 	# Format response expected by the frontend
 	formatted = {}
@@ -137,66 +160,117 @@ def api_data():
 		ts_iso = datetime.fromtimestamp(ts_epoch, tz=timezone.utc).isoformat()
 		formatted[sensor_id] = {
 			"sensor_value": entry.get("sensor_value"),
+			"filtered_value": entry.get("filtered_value"),
 			"timestamp": ts_iso,
 			"sensor_type": sensor_config.get_sensor_type(sensor_id),
 			"sensor_label": sensor_config.get_sensor_label(sensor_id),
 			"sensor_units": sensor_config.get_sensor_units(sensor_id),
 			"sample_name": sensor_config.get_sample_name(sensor_id),
 		}
-	return jsonify(formatted)
+		if sensor_id in health:
+			formatted[sensor_id]["sensor_health"] = health[sensor_id]
+	return json_response(formatted)
 
 
 @app.post("/api/start")
 def api_start():
 	data = request.get_json(silent=True) or {}
-	s1 = (data.get("sample1") or "").strip()
-	s2 = (data.get("sample2") or "").strip()
-	if not s1 or not s2:
-		return jsonify({"ok": False, "error": "Both Sample 1 and Sample 2 IDs are required"}), 400
-
-	ACTIVE_SAMPLES["sample1"] = s1
-	ACTIVE_SAMPLES["sample2"] = s2
-
-	if TEMP1_ID in sensor_config.mapping:
-		sensor_config.mapping[TEMP1_ID]["sample_name"] = s1
-	if TEMP2_ID in sensor_config.mapping:
-		sensor_config.mapping[TEMP2_ID]["sample_name"] = s2
-	if DIAL1_MANUAL_ID in sensor_config.mapping:
-		sensor_config.mapping[DIAL1_MANUAL_ID]["sample_name"] = s1
-	if DIAL2_MANUAL_ID in sensor_config.mapping:
-		sensor_config.mapping[DIAL2_MANUAL_ID]["sample_name"] = s2
+	names = {slot: (data.get(slot) or "").strip() for slot in sensor_config.slots}
+	missing = [st["label"] for st in sensor_config.stations if not names[st["slot"]]]
+	if missing:
+		return jsonify({"ok": False, "error": f"Sample IDs are required for: {', '.join(missing)}"}), 400
 
+	sensor_config.assign_samples(names)
 	engine.start_logging()
-	return jsonify({"ok": True, "logging": True, "sample1": s1, "sample2": s2})
+	return jsonify({"ok": True, "logging": True, **names})
 
 
 @app.post("/api/stop")
 def api_stop():
 	engine.stop_logging()
-	ACTIVE_SAMPLES["sample1"] = ""
-	ACTIVE_SAMPLES["sample2"] = ""
-	if TEMP1_ID in sensor_config.mapping:
-		sensor_config.mapping[TEMP1_ID]["sample_name"] = ""
-	if TEMP2_ID in sensor_config.mapping:
-		sensor_config.mapping[TEMP2_ID]["sample_name"] = ""
-	if DIAL1_MANUAL_ID in sensor_config.mapping:
-		sensor_config.mapping[DIAL1_MANUAL_ID]["sample_name"] = ""
-	if DIAL2_MANUAL_ID in sensor_config.mapping:
-		sensor_config.mapping[DIAL2_MANUAL_ID]["sample_name"] = ""
+	sensor_config.clear_samples()
 	return jsonify({"ok": True, "logging": False})
 
 
 @app.get("/api/history")
 def api_history():
-	return jsonify(engine.get_full_log())
+	if hub is not None:
+		if request.args.get("format") == "columnar":
+			recs, sensors, samples = hub.history()
+			return json_response(columnar_history(recs, dumps(sensors), dumps(samples)))
+		return json_response(hub.get_full_log())
+	# Optional start/end (epoch seconds) are binary-searched in the mapped run file
+	start = request.args.get("start", type=float)
+	end = request.args.get("end", type=float)
+	store = engine.logger.data
+	if start is None and end is None:
+		recs = store.records()
+	else:
+		recs = store.between(start if start is not None else float("-inf"),
+							 end if end is not None else float("inf"))
+
+	if request.args.get("format") == "columnar":
+		# metadata tables are encoded once and reused until they change
+		sensors = fragments.get("sensors", (store.path, len(store.sensors)), lambda: store.sensors)
+		samples = fragments.get("samples", len(sensor_config.sample_names),
+								lambda: list(sensor_config.sample_names))
+		return json_response(columnar_history(recs, sensors, samples))
+
+	sensors = store.sensors   # this run's table, even if a new run starts mid-stream
+
+	def chunks():
+		# ITER_CHUNK rows are built and encoded at a time instead of the whole run
+		for lo in range(0, len(recs), ITER_CHUNK):
+			rows = store.to_rows(recs[lo:lo + ITER_CHUNK], sensors)
+			# rows carry an integer sample_id; resolve names only when serializing
+			for row in rows:
+				row["sample_name"] = sensor_config.sample_name_for(row["sample_id"])
+			yield rows
+	return json_array_stream(chunks())
+
+
+@app.get("/api/chart")
+def api_chart():
+	"""
+	Min/max-decimated series for one chart window.
+	Query: points (pixel budget per series), window (seconds, 0 = whole run)
+	or explicit start/end epochs.
+	"""
+	start = request.args.get("start", type=float)
+	end = request.args.get("end", type=float)
+	window = request.args.get("window", default=0.0, type=float)
+	points = request.args.get("points", default=600, type=int)
+	if hub is not None:
+		return jsonify(chart_window(hub.series(), start, end, window, points))
+	return jsonify(chart_index.window(start, end, window, points))
+
+
+@app.get("/api/hub")
+def api_hub():
+	if hub is None:
+		return jsonify({"enabled": False, "fixtures": {}})
+	return jsonify({"enabled": True, "fixtures": hub.status()})
+
+
+@app.get("/api/analysis")
+def api_analysis():
+	# Only rows logged since the previous request are processed
+	analyzer.update()
+	return jsonify(analyzer.summary(sensor_config.active_samples()))
 
 
 @app.get("/api/status")
 def api_status():
 	return jsonify(
 		{"logging": engine.logger.is_logging(),
-		 "sample1": ACTIVE_SAMPLES["sample1"],
-		 "sample2": ACTIVE_SAMPLES["sample2"]}
+		 **sensor_config.active_samples(),
+		 "stations": [
+			 {"slot": st["slot"], "label": st["label"], "sensors": st["sensors"],
+			  "manual_dial": st["manual_dial"]}
+			 for st in sensor_config.stations
+		 ],
+		 "filters": engine.filters.stats(),
+		 "resolution": getattr(engine.poller, "get_resolution", dict)()}
 	)
 
 
@@ -212,14 +286,12 @@ def manual_dial_input():
 			return False
 
 	provided = []
-	if "dial_1" in data:
-		if not is_number(data["dial_1"]):
-			return ("dial_1 must be numeric", 400)
-		provided.append(("dial_1", float(data["dial_1"])))
-	if "dial_2" in data:
-		if not is_number(data["dial_2"]):
-			return ("dial_2 must be numeric", 400)
-		provided.append(("dial_2", float(data["dial_2"])))
+	for key, dial in sensor_config.manual_dials().items():
+		if key not in data:
+			continue
+		if not is_number(data[key]):
+			return (f"{key} must be numeric", 400)
+		provided.append((dial, float(data[key])))
 
 	if not provided:
 		return ("Provide at least one numeric value", 400)
@@ -229,15 +301,9 @@ def manual_dial_input():
 	ts_epoch = now.timestamp()
 
 	rows = []
-	for name, val in provided:
-		if name == "dial_1":
-			sensor_id = DIAL1_MANUAL_ID
-			sensor_label = "Manual Dial 1"
-			sample_name = ACTIVE_SAMPLES["sample1"]
-		else:
-			sensor_id = DIAL2_MANUAL_ID
-			sensor_label = "Manual Dial 2"
-			sample_name = ACTIVE_SAMPLES["sample2"]
+	for sensor_id, val in provided:
+		sensor_label = sensor_config.get_sensor_label(sensor_id)
+		sample_id = sensor_config.get_sample_id(sensor_id)
 
 		rows.append(
 			{
@@ -246,7 +312,7 @@ def manual_dial_input():
 				"sensor_type": "dial_indicator",
 				"sensor_label": sensor_label,
 				"sensor_units": "mm",
-				"sample_name": sample_name or "",
+				"sample_name": sensor_config.sample_name_for(sample_id),
 				"value": val,
 			}
 		)
@@ -258,8 +324,9 @@ def manual_dial_input():
 				"sensor_type": "dial_indicator",
 				"sensor_label": sensor_label,
 				"sensor_units": "mm",
-				"sample_name": sample_name or "",
+				"sample_id": sample_id,
 				"sensor_value": val,
+				"filtered_value": val,   # manual entries bypass the filters
 			}
 		)
 
@@ -267,63 +334,48 @@ def manual_dial_input():
 	return jsonify({"ok": True, "timestamp": ts_iso, "saved_rows": len(provided)})
 
 
-# ---------- Export CSV: save to disk AND download ----------
-@app.get("/api/export")
-def api_export():
-	history = engine.get_full_log() or []
-	if not history:
-		return jsonify({"error": "No history data available"}), 404
+# ---------- Bulk import of legacy/new CSV logs from exports/ ----------
+@app.post("/api/import")
+def api_import():
+	if engine.logger.is_logging():
+		return jsonify({"ok": False, "error": "Stop logging before importing"}), 409
+	data = request.get_json(silent=True) or {}
+	names = data.get("files") or []
+	if not names:
+		return jsonify({"ok": False, "error": "Provide 'files' (CSV names in exports/)"}), 400
 
-	output = io.StringIO()
-	writer = csv.writer(output)
-	writer.writerow([
-		"ts_epoch", "ts_utc", "ts_local",
-		"sensor_id", "sensor_type", "sensor_label", "sensor_units",
-		"sample_name", "value"
-	])
-
-	rows_written = 0
-	for row in history:
-		ts_epoch = _to_epoch(row.get("timestamp"))
-		if ts_epoch is None:
-			# skip malformed timestamps
-			continue
+	paths = []
+	for name in names:
+		path = os.path.join("exports", os.path.basename(str(name)))
+		if not os.path.isfile(path):
+			return jsonify({"ok": False, "error": f"{name} not found in exports/"}), 404
+		paths.append(path)
 
-		dt_utc = datetime.fromtimestamp(ts_epoch, tz=timezone.utc)
-		ts_utc = dt_utc.isoformat()
-		ts_local = dt_utc.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+	try:
+		result = import_into(engine.logger, paths, merge=bool(data.get("merge", True)))
+	except ValueError as e:
+		return jsonify({"ok": False, "error": str(e)}), 400
+	return jsonify({"ok": True, **result})
 
-		value = row.get("sensor_value", row.get("value", ""))
 
-		writer.writerow([
-			f"{ts_epoch:.6f}", ts_utc, ts_local,
-			row.get("sensor_id", ""),
-			row.get("sensor_type", ""),
-			row.get("sensor_label", ""),
-			row.get("sensor_units", ""),
-			row.get("sample_name", ""),
-			value
-		])
-		rows_written += 1
+# ---------- Export CSV: save to disk AND download ----------
+@app.get("/api/export")
+def api_export():
+	if not engine.get_full_log():
+		return jsonify({"error": "No history data available"}), 404
 
-	if rows_written == 0:
+	# Appends only rows logged since the previous export to this run's CSV
+	disk_path = exporter.export()
+	if disk_path is None:
 		return jsonify({"error": "No valid rows to export"}), 400
 
-	csv_text = output.getvalue()
-	output.close()
-
-	# Save a copy to exports/ with a UTC timestamped filename
-	os.makedirs("exports", exist_ok=True)
-	fname = "log_" + datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S") + ".csv"
-	disk_path = os.path.join("exports", fname)
-	with open(disk_path, "w", encoding="utf-8", newline="") as f:
-		f.write(csv_text)
-
-	# Return the same file to the browser
-	return Response(
-		csv_text.encode("utf-8"),
+	# Return the run's file to the browser
+	return send_file(
+		os.path.abspath(disk_path),
 		mimetype="text/csv",
-		headers={"Content-Disposition": f"attachment; filename={fname}"},
+		as_attachment=True,
+		download_name=os.path.basename(disk_path),
+		max_age=0,
 	)
 
 
@@ -336,5 +388,7 @@ if __name__ == "__main__":
 	finally:
 		try:
 			engine.stop()
+			if hub is not None:
+				hub.stop()
 		except Exception:
 			pass
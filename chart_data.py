@@ -0,0 +1,112 @@
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from logger import DataLogger
+
+MIN_POINTS = 16
+MAX_POINTS = 4000
+
+
+def decimate_minmax(t: np.ndarray, v: np.ndarray, t0: float, t1: float, points: int):
+	"""
+	Reduce the sorted series to at most `points` samples within [t0, t1]
+	by keeping the min and max of each of points/2 equal-time buckets,
+	so spikes survive decimation.
+	"""
+	lo = np.searchsorted(t, t0, side="left")
+	hi = np.searchsorted(t, t1, side="right")
+	t, v = t[lo:hi], v[lo:hi]
+	if len(t) <= points:
+		return t, v
+
+	n_buckets = max(1, points // 2)
+	width = (t1 - t0) / n_buckets or 1.0
+	bucket = np.minimum(((t - t0) / width).astype(np.int64), n_buckets - 1)
+	order = np.lexsort((v, bucket))              # by bucket, then value
+	b_sorted = bucket[order]
+	first = np.flatnonzero(np.r_[True, b_sorted[1:] != b_sorted[:-1]])
+	last = np.r_[first[1:] - 1, len(order) - 1]
+	keep = np.unique(np.concatenate((order[first], order[last])))   # time order
+	return t[keep], v[keep]
+
+
+def chart_window(series: Iterable[Tuple[str, Dict[str, object], np.ndarray, np.ndarray]],
+				 start: Optional[float], end: Optional[float], window: float, points: int) -> Dict[str, object]:
+	"""
+	Build the /api/chart payload from (sensor_id, meta, t, v) series
+	(arrays or lists, sorted by time). Array views are only read within
+	the window, so cost follows the window, not the run length.
+
+	:param start/end: Window bounds in epoch seconds (end defaults to the newest sample)
+	:param window: Seconds before end when start is not given (0 = from the first sample)
+	:param points: Point budget per series (typically the chart's pixel width)
+	"""
+	series = [(sid, meta, np.asarray(t, dtype=np.float64), np.asarray(v, dtype=np.float64))
+			  for sid, meta, t, v in series]
+	points = min(max(int(points), MIN_POINTS), MAX_POINTS)
+	if end is None:
+		# replayed and hub data need not line up with this machine's clock
+		lasts = [t[-1] for _, _, t, _ in series if len(t)]
+		end = max(lasts) if lasts else time.time()
+	if start is None:
+		if window > 0:
+			start = end - window
+		else:
+			firsts = [t[0] for _, _, t, _ in series if len(t)]
+			start = min(firsts) if firsts else end
+
+	out = {}
+	for sensor_id, meta, t, v in series:
+		# cut the window out of the (view of the) full series before touching values
+		lo = np.searchsorted(t, start, side="left")
+		hi = np.searchsorted(t, end, side="right")
+		t, v = t[lo:hi], v[lo:hi]
+		ok = ~np.isnan(v)
+		if not ok.all():
+			t, v = t[ok], v[ok]
+		dt, dv = decimate_minmax(t, v, start, end, points)
+		if len(dt):
+			out[sensor_id] = {**meta, "t": dt.tolist(), "v": dv.tolist()}
+	return {"start": start, "end": end, "points": points, "series": out}
+
+
+class SeriesIndex:
+	def __init__(self, logger: DataLogger):
+		"""
+		Chart windows over the logger's current run, cut straight out of its
+		mapped run file with HistoryStore.between(), so a request only reads
+		the records inside its window and nothing is copied into RAM between
+		requests.
+
+		:param logger: DataLogger whose run is charted
+		"""
+		self.logger = logger
+
+	def window(self, start: Optional[float], end: Optional[float], window: float, points: int):
+		store = self.logger.data
+		sensors = store.sensors
+		# same defaults as chart_window(), resolved up front to bound the read
+		if end is None:
+			end = store.last_ts()
+		if start is not None:
+			t0 = start
+		elif window > 0 and end is not None:
+			t0 = end - window
+		else:
+			t0 = float("-inf")
+		recs = store.between(t0, end if end is not None else float("inf"))
+
+		series = []
+		sensor = recs["sensor"]
+		for idx in np.unique(sensor).tolist():
+			part = recs[sensor == idx]
+			t, v = part["ts"], part["value"]
+			if len(t) > 1 and (np.diff(t) < 0).any():
+				# late manual entries: chart_window needs each series in time order
+				order = np.argsort(t, kind="stable")
+				t, v = t[order], v[order]
+			meta = sensors[idx]
+			series.append((meta["sensor_id"], {k: meta[k] for k in ("sensor_type", "sensor_label", "sensor_units")}, t, v))
+		return chart_window(series, start, end, window, points)
@@ -5,26 +5,38 @@ from typing import Optional, Dict
 from sensors.temp_reader import TemperatureSensorPoller
 from logger import DataLogger
 from sensor_config import sensor_config
+from signal_filters import FilterPipeline
 
 
 class DataEngine:
-	def __init__(self, poll_interval: float = 1.0):
+	def __init__(self, poll_interval: float = 1.0, filters: Optional[FilterPipeline] = None,
+				 source=None, history_dir: Optional[str] = None):
 		"""
 		Core engine that handles polling sensor data and logging.
 
 		:param poll_interval: Time in seconds between each poll
+		:param filters: Streaming filter pipeline between poller and logger
+		:param source: Replacement for the live poller (e.g. replay.CsvReplaySource);
+		               sources with bind() push batches into ingest() themselves
+		:param history_dir: Where the logger's run files go (default: $HISTORY_DIR or ./history)
 		"""
-		self.poller = TemperatureSensorPoller()
-		self.logger = DataLogger(sensor_config)
+		self.poller = source if source is not None else TemperatureSensorPoller()
+		self.logger = DataLogger(sensor_config, history_dir=history_dir)
+		self.filters = filters if filters is not None else FilterPipeline()
 		self.poll_interval = poll_interval
 		self._stop_event = threading.Event()
 		self._thread: Optional[threading.Thread] = None
 
 	def start(self):
 		"""Start the polling thread and sensor hardware."""
+		pushes = hasattr(self.poller, "bind")
+		if pushes:
+			# push-style sources (replay) call ingest() themselves
+			self.poller.bind(self.ingest)
 		self.poller.start()
-		self._thread = threading.Thread(target=self._poll_loop, daemon=True)
-		self._thread.start()
+		if not pushes:
+			self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+			self._thread.start()
 		print("[DataEngine] Started.")
 
 	def stop(self):
@@ -38,25 +50,45 @@ class DataEngine:
 	def _poll_loop(self):
 		"""Background loop to continuously poll and log data."""
 		while not self._stop_event.is_set():
-			sensor_data = self.poller.get_data()
-			self.logger.log(sensor_data)
+			self.ingest(self.poller.get_data())
 			time.sleep(self.poll_interval)
 
+	def ingest(self, sensor_data: Dict[str, Dict[str, float]], apply_filters: bool = True):
+		"""Filter (optionally) and log one batch of poller-style readings."""
+		if apply_filters:
+			sensor_data = self.filters.apply(sensor_data)
+		self.logger.log(sensor_data)
+
 	def start_logging(self):
-		"""Begin saving data to memory."""
+		"""Begin saving data (probes switch to 12-bit; a replay source starts playing)."""
+		self._set_high_resolution(True)
 		self.logger.start()
+		play = getattr(self.poller, "play", None)
+		if play is not None:
+			play()
 
 	def stop_logging(self):
-		"""Stop saving data to memory."""
+		"""Stop saving data to memory (probes drop back to idle resolution)."""
 		self.logger.stop()
+		self._set_high_resolution(False)
+
+	def _set_high_resolution(self, enabled: bool):
+		# replay sources have no hardware resolution to manage
+		setter = getattr(self.poller, "set_high_resolution", None)
+		if setter is not None:
+			setter(enabled)
 
 	def export_csv(self) -> Optional[str]:
 		"""Export the collected log to CSV file."""
 		return self.logger.export_csv()
 
 	def get_latest_data(self) -> Dict[str, Dict[str, float]]:
-		"""Return the most recent sensor data."""
-		return self.poller.get_data()
+		"""Return the most recent sensor data (raw and filtered)."""
+		return self.filters.apply(self.poller.get_data())
+
+	def get_sensor_health(self) -> Dict[str, Dict[str, object]]:
+		"""Per-probe read health from the poller (empty for replay sources)."""
+		return getattr(self.poller, "get_health", dict)()
 
 	def get_full_log(self):
 		return self.logger.get_full_log()
@@ -0,0 +1,100 @@
+import json
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from flask import Response
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+# Columnar history layout: per-row arrays indexing into the sensors/samples tables
+COLUMNS = (("t", "ts"), ("v", "value"), ("f", "filtered"), ("sensor", "sensor"), ("sample", "sample"))
+
+
+def dumps(obj) -> bytes:
+	"""JSON bytes via orjson when installed (NumPy arrays encoded natively), else the stdlib."""
+	if orjson is not None:
+		return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+	return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _default(obj):
+	if isinstance(obj, np.ndarray):
+		return obj.tolist()
+	if isinstance(obj, np.generic):
+		return obj.item()
+	raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def encode_array(a: np.ndarray) -> bytes:
+	"""One numeric column as a JSON array; NaN becomes null."""
+	a = np.ascontiguousarray(a)
+	if orjson is not None:
+		return orjson.dumps(a, option=orjson.OPT_SERIALIZE_NUMPY)   # NaN -> null
+	if a.dtype.kind == "f":
+		return dumps(np.where(np.isnan(a), None, a).tolist())
+	return dumps(a.tolist())
+
+
+def json_response(body, status: int = 200) -> Response:
+	"""Flask response from pre-encoded bytes or any object dumps() accepts."""
+	if not isinstance(body, (bytes, bytearray)):
+		body = dumps(body)
+	return Response(body, status=status, mimetype="application/json")
+
+
+def json_array_stream(chunks: Iterable[list]) -> Response:
+	"""
+	Flask response streaming one JSON array from successive lists of items,
+	so only one chunk is encoded (and held) at a time.
+	"""
+	def generate():
+		yield b"["
+		first = True
+		for items in chunks:
+			if not items:
+				continue
+			body = dumps(items)[1:-1]   # drop the chunk's own brackets
+			yield body if first else b"," + body
+			first = False
+		yield b"]"
+	return Response(generate(), mimetype="application/json")
+
+
+class FragmentCache:
+	"""
+	Pre-encoded JSON for values that rarely change (sensor and sample
+	tables), keyed by name and re-encoded only when the version changes.
+	"""
+
+	def __init__(self):
+		self._fragments: Dict[str, Tuple[object, bytes]] = {}
+		self._lock = threading.Lock()
+
+	def get(self, name: str, version, build) -> bytes:
+		"""Cached bytes for name; build() is called and encoded when version differs."""
+		with self._lock:
+			hit = self._fragments.get(name)
+			if hit is not None and hit[0] == version:
+				return hit[1]
+		encoded = dumps(build())
+		with self._lock:
+			self._fragments[name] = (version, encoded)
+		return encoded
+
+
+def columnar_history(recs: np.ndarray, sensors: bytes, samples: bytes) -> bytes:
+	"""
+	Assemble {"sensors": [...], "samples": [...], "t": [...], "v": [...],
+	"f": [...], "sensor": [...], "sample": [...]} from history records and
+	pre-encoded sensor/sample tables. sensor/sample are indexes into those
+	tables (sample -1 = none).
+	"""
+	parts: List[bytes] = [b'{"sensors":', sensors, b',"samples":', samples]
+	for key, field in COLUMNS:
+		parts += [b',"', key.encode(), b'":', encode_array(recs[field])]
+	parts.append(b"}")
+	return b"".join(parts)
@@ -0,0 +1,291 @@
+import bisect
+import json
+import mmap
+import os
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# One fixed-size little-endian record per reading, in append order.
+# ts_max is the running max of ts, so it is sorted even when rows arrive
+# slightly out of order (manual entries) and can be binary-searched.
+RECORD_DTYPE = np.dtype([
+	("ts", "<f8"),          # epoch seconds
+	("ts_max", "<f8"),      # max(ts) over this and all earlier records
+	("value", "<f8"),       # sensor_value (NaN = None)
+	("filtered", "<f8"),    # filtered_value (NaN = None)
+	("sensor", "<u2"),      # index into the run's sensors list (sidecar JSON)
+	("sample", "<i4"),      # sample_id (-1 = none)
+])
+GROW_RECORDS = 1 << 16      # run files grow (and are re-mapped) in steps of this many records
+ITER_CHUNK = 4096           # records converted to dicts per step when iterating
+
+
+def default_history_dir() -> str:
+	return os.environ.get("HISTORY_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")
+
+
+class HistoryStore:
+	def __init__(self, directory: Optional[str] = None):
+		"""
+		Append-only run history on disk as fixed-size binary records
+		(<run>.bin) plus a small sidecar (<run>.json) holding the sensor
+		metadata table. Readers work on a read-only mmap of the .bin file
+		through np.frombuffer, so the page cache is the only copy of the data.
+
+		The file is pre-sized in GROW_RECORDS steps so the map is only
+		rebuilt when it grows; a finished run is truncated to its records
+		(a run cut short by a crash may end in zero-filled records).
+
+		Behaves like the list of row dicts DataLogger used to keep: len(),
+		indexing and slicing return rows; records()/between()/latest_per_sensor()
+		are the vectorized paths for large runs.
+
+		:param directory: Where run files go (default: $HISTORY_DIR or ./history)
+		"""
+		self.directory = directory or default_history_dir()
+		self.path: Optional[str] = None
+		self.sensors: List[Dict[str, str]] = []      # index -> sensor_id/type/label/units
+		self._sensor_index: Dict[str, int] = {}
+		self._last: List[int] = []                   # sensor index -> index of its newest record
+		self._n = 0
+		self._ts_max = float("-inf")
+		self._disorder = 0.0                          # max(ts_max - ts): how late a row may arrive
+		self._file = None
+		self._capacity = 0                            # records the file is currently sized for
+		self._mm: Optional[mmap.mmap] = None
+		self._mm_records = 0
+		self._retired: List[mmap.mmap] = []          # old maps still referenced by views
+		self._lock = threading.Lock()
+
+	# ---------- writing ----------
+	def new_run(self, started: Optional[float] = None):
+		"""Start a new, empty run file; the previous run stays on disk."""
+		with self._lock:
+			if self._file is not None:
+				self._file.truncate(self._n * RECORD_DTYPE.itemsize)
+				self._file.close()
+			started = started if started is not None else time.time()
+			os.makedirs(self.directory, exist_ok=True)
+			stem = "run_" + time.strftime("%Y%m%d_%H%M%S", time.gmtime(started))
+			base, i = os.path.join(self.directory, stem), 1
+			while os.path.exists(base + ".bin"):
+				i += 1
+				base = os.path.join(self.directory, f"{stem}_{i}")
+			self.path = base + ".bin"
+			self._file = open(self.path, "w+b")
+			self._capacity = 0
+			self.sensors, self._sensor_index, self._last = [], {}, []
+			self._n, self._ts_max, self._disorder = 0, float("-inf"), 0.0
+			self._retire_map()
+			self._write_sidecar(started)
+
+	def clear(self):
+		self.new_run()
+
+	def append(self, row: Dict[str, object]):
+		self.extend([row])
+
+	def extend(self, rows: Iterable[Dict[str, object]]):
+		"""Append row dicts (DataLogger layout) as one write."""
+		rows = list(rows)
+		if not rows:
+			return
+		if self._file is None:
+			self.new_run(float(rows[0]["timestamp"]))
+		with self._lock:
+			recs = np.empty(len(rows), dtype=RECORD_DTYPE)
+			meta_changed = False
+			for i, row in enumerate(rows):
+				sid = row["sensor_id"]
+				idx = self._sensor_index.get(sid)
+				if idx is None:
+					idx = self._sensor_index[sid] = len(self.sensors)
+					self.sensors.append({
+						"sensor_id": sid,
+						"sensor_type": row.get("sensor_type", ""),
+						"sensor_label": row.get("sensor_label", ""),
+						"sensor_units": row.get("sensor_units", ""),
+					})
+					meta_changed = True
+				value = row.get("sensor_value", row.get("value"))
+				filtered = row.get("filtered_value")
+				sample = row.get("sample_id")
+				recs[i] = (float(row["timestamp"]), 0.0,
+						   np.nan if value is None else float(value),
+						   np.nan if filtered is None else float(filtered),
+						   idx, -1 if sample is None else sample)
+			self._write(recs, meta_changed)
+
+	def extend_columns(self, cols: Dict[str, np.ndarray]):
+		"""
+		Bulk append from columns (ts, sensor_id, sensor_type, sensor_label,
+		sensor_units, sample_id, value, filtered_value with NaN = None)
+		without building a dict per row.
+		"""
+		n = len(cols["ts"])
+		if not n:
+			return
+		if self._file is None:
+			self.new_run(float(cols["ts"][0]))
+		with self._lock:
+			ids, first, inverse = np.unique(cols["sensor_id"], return_index=True, return_inverse=True)
+			meta_changed = False
+			index = np.empty(len(ids), dtype=np.uint16)
+			for k, (sid, row) in enumerate(zip(ids.tolist(), first.tolist())):
+				idx = self._sensor_index.get(sid)
+				if idx is None:
+					idx = self._sensor_index[sid] = len(self.sensors)
+					self.sensors.append({
+						"sensor_id": sid,
+						"sensor_type": str(cols["sensor_type"][row]),
+						"sensor_label": str(cols["sensor_label"][row]),
+						"sensor_units": str(cols["sensor_units"][row]),
+					})
+					meta_changed = True
+				index[k] = idx
+			recs = np.empty(n, dtype=RECORD_DTYPE)
+			recs["ts"] = cols["ts"]
+			recs["value"] = cols["value"]
+			recs["filtered"] = cols["filtered_value"]
+			recs["sensor"] = index[inverse]
+			recs["sample"] = cols["sample_id"]
+			self._write(recs, meta_changed)
+
+	def _write(self, recs: np.ndarray, meta_changed: bool):
+		"""Fill ts_max and append records to the run file (caller holds the lock)."""
+		ts_max = np.maximum.accumulate(np.r_[self._ts_max, recs["ts"]])[1:]
+		recs["ts_max"] = ts_max
+		disorder = float((ts_max - recs["ts"]).max())
+		if disorder > self._disorder:
+			self._disorder = disorder
+			meta_changed = True
+		self._ts_max = float(ts_max[-1])
+		end = self._n + len(recs)
+		if end > self._capacity:
+			self._capacity = -(-end // GROW_RECORDS) * GROW_RECORDS
+			self._file.truncate(self._capacity * RECORD_DTYPE.itemsize)
+		self._file.seek(self._n * RECORD_DTYPE.itemsize)
+		self._file.write(recs.tobytes())
+		self._file.flush()
+		# newest record per sensor in this batch (first hit when scanning it backwards)
+		self._last += [-1] * (len(self.sensors) - len(self._last))
+		idx, back = np.unique(recs["sensor"][::-1], return_index=True)
+		for s, j in zip(idx.tolist(), back.tolist()):
+			self._last[s] = self._n + len(recs) - 1 - j
+		self._n += len(recs)   # only after the bytes reach the file, so readers never map a partial record
+		if meta_changed:
+			self._write_sidecar()
+
+	def _write_sidecar(self, started: Optional[float] = None):
+		sidecar = self.path[:-4] + ".json"
+		meta = {}
+		if started is None and os.path.exists(sidecar):
+			with open(sidecar, "r", encoding="utf-8") as f:
+				meta = json.load(f)
+		meta.update(record_dtype=RECORD_DTYPE.descr, sensors=self.sensors, disorder=self._disorder)
+		if started is not None:
+			meta["started"] = started
+		tmp = sidecar + ".tmp"
+		with open(tmp, "w", encoding="utf-8") as f:
+			json.dump(meta, f)
+		os.replace(tmp, sidecar)
+
+	# ---------- reading ----------
+	def records(self, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+		"""Read-only structured view of records [lo, hi) straight over the mmap."""
+		with self._lock:
+			n = self._n
+			if n == 0:
+				return np.empty(0, dtype=RECORD_DTYPE)
+			if self._mm_records < n:
+				# only after the file grew by a GROW_RECORDS step
+				self._retire_map()
+				self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+				self._mm_records = len(self._mm) // RECORD_DTYPE.itemsize
+			mm = self._mm
+		view = np.frombuffer(mm, dtype=RECORD_DTYPE, count=n)
+		return view[lo:hi]
+
+	def _retire_map(self):
+		"""Drop the current map; close it and older ones once no array views use them (caller holds the lock)."""
+		if self._mm is not None:
+			self._retired.append(self._mm)
+		self._mm, self._mm_records = None, 0
+		still_used = []
+		for mm in self._retired:
+			try:
+				mm.close()
+			except BufferError:   # exported to a NumPy view that is still alive
+				still_used.append(mm)
+		self._retired = still_used
+
+	def between(self, t0: float, t1: float) -> np.ndarray:
+		"""Records with t0 <= ts <= t1, found by binary search on ts_max."""
+		recs = self.records()
+		# bisect probes ~log2(n) elements of the strided column; np.searchsorted
+		# would first copy the whole column out of the mapping
+		ts_max = recs["ts_max"]
+		lo = bisect.bisect_left(ts_max, t0)
+		hi = bisect.bisect_right(ts_max, t1 + self._disorder, lo)
+		window = recs[lo:hi]
+		if self._disorder:
+			window = window[(window["ts"] >= t0) & (window["ts"] <= t1)]
+		return window
+
+	def last_ts(self) -> Optional[float]:
+		"""Newest timestamp in the run, or None while it is empty."""
+		return self._ts_max if self._n else None
+
+	def latest_per_sensor(self) -> Dict[str, Dict[str, object]]:
+		"""Newest row of every sensor, from the per-sensor index kept by the writer."""
+		with self._lock:
+			last = sorted(i for i in self._last if i >= 0)
+		recs = self.records()
+		rows = self.to_rows(recs[last])
+		return {row["sensor_id"]: row for row in rows}
+
+	def to_rows(self, recs: np.ndarray, sensors: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, object]]:
+		"""
+		Row dicts (DataLogger layout) for a slice of records. Pass the run's
+		sensors table when converting after a new run may have started.
+		"""
+		sensors = sensors if sensors is not None else self.sensors
+		value = recs["value"]
+		filtered = recs["filtered"]
+		values = np.where(np.isnan(value), None, value).tolist()
+		filtereds = np.where(np.isnan(filtered), None, filtered).tolist()
+		out = []
+		for ts, s, sample, v, fv in zip(recs["ts"].tolist(), recs["sensor"].tolist(),
+										recs["sample"].tolist(), values, filtereds):
+			meta = sensors[s]
+			out.append({
+				"timestamp": ts, "sensor_id": meta["sensor_id"], "sensor_type": meta["sensor_type"],
+				"sensor_label": meta["sensor_label"], "sensor_units": meta["sensor_units"],
+				"sample_id": None if sample < 0 else sample, "sensor_value": v, "filtered_value": fv,
+			})
+		return out
+
+	# ---------- list-of-rows compatibility ----------
+	def __len__(self) -> int:
+		return self._n
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			if key.step not in (None, 1):
+				return self.to_rows(self.records()[key])
+			lo, hi, _ = key.indices(self._n)
+			return self.to_rows(self.records(lo, max(lo, hi)))
+		n = self._n
+		if key < 0:
+			key += n
+		if not 0 <= key < n:
+			raise IndexError("history index out of range")
+		return self.to_rows(self.records(key, key + 1))[0]
+
+	def __iter__(self) -> Iterator[Dict[str, object]]:
+		n = self._n
+		for lo in range(0, n, ITER_CHUNK):
+			yield from self.to_rows(self.records(lo, min(lo + ITER_CHUNK, n)))
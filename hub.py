@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from history_store import RECORD_DTYPE
+from series import Series
+
+try:
+	import aiohttp
+except ImportError:
+	aiohttp = None
+
+HUB_CONFIG_PATH = os.path.join("config", "hub.json")
+MAX_CHANNEL_POINTS = 6 * 3600   # newest readings kept per channel (6 h at 1 Hz)
+
+
+def load_fixtures(path: str = HUB_CONFIG_PATH) -> Dict[str, str]:
+	"""
+	Fixture name -> base URL of that fixture's dashboard.
+
+	Read from HUB_FIXTURES ("pi1=http://10.0.0.11:5000,pi2=http://10.0.0.12:5000")
+	or from config/hub.json ({"fixtures": {"pi1": "http://..."}}). Empty when
+	neither is set, i.e. hub mode is off.
+	"""
+	env = os.getenv("HUB_FIXTURES", "").strip()
+	fixtures: Dict[str, str] = {}
+	if env:
+		for i, item in enumerate(x.strip() for x in env.split(",")):
+			if not item:
+				continue
+			name, sep, url = item.partition("=")
+			if not sep:
+				name, url = f"fixture{i + 1}", item
+			fixtures[name.strip()] = url.strip().rstrip("/")
+		return fixtures
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			data = json.load(f)
+		return {k: v.rstrip("/") for k, v in (data.get("fixtures") or {}).items()}
+	except (FileNotFoundError, ValueError):
+		return {}
+
+
+def _num(x) -> float:
+	return np.nan if x is None else float(x)
+
+
+def _or_none(x):
+	return None if np.isnan(x) else float(x)
+
+
+def _iso_to_epoch(ts) -> Optional[float]:
+	if isinstance(ts, (int, float)):
+		return float(ts)
+	try:
+		s = ts.strip()
+		if s.endswith("Z"):
+			s = s[:-1] + "+00:00"
+		return datetime.fromisoformat(s).timestamp()
+	except Exception:
+		return None
+
+
+class _Channel:
+	"""Time-indexed series for one fixture + sensor (raw and filtered share timestamps; NaN = None)."""
+	__slots__ = ("fixture", "sensor_id", "meta", "values", "filtered")
+
+	def __init__(self, fixture: str, sensor_id: str):
+		self.fixture = fixture
+		self.sensor_id = sensor_id
+		self.meta: Dict[str, object] = {}
+		self.values = Series()
+		self.filtered = Series()
+
+	def last_ts(self) -> Optional[float]:
+		return float(self.values.t[-1]) if self.values.n else None
+
+
+class FixtureHub:
+	def __init__(self, fixtures: Dict[str, str], poll_interval: float = 1.0,
+				 timeout: Optional[float] = None, max_points: int = MAX_CHANNEL_POINTS):
+		"""
+		Aggregates several fixture dashboards into one store.
+
+		Every poll_interval the hub fetches each fixture's /api/data
+		concurrently over a shared keep-alive connection pool, and appends
+		readings with a new timestamp to a series keyed "<fixture>/<sensor_id>".
+
+		:param fixtures: Fixture name -> base URL
+		:param poll_interval: Seconds between fetch rounds
+		:param timeout: Per-request timeout (defaults to 80% of poll_interval),
+		                so one slow fixture can't delay the others
+		:param max_points: Newest readings kept per channel; older ones are dropped
+		"""
+		if aiohttp is None:
+			raise RuntimeError("hub mode needs aiohttp (pip3 install aiohttp)")
+		self.fixtures = dict(fixtures)
+		self.poll_interval = poll_interval
+		self.timeout = timeout if timeout is not None else poll_interval * 0.8
+		self.max_points = max_points
+		self.channels: Dict[str, _Channel] = {}
+		self.fixture_status: Dict[str, Dict[str, object]] = {
+			name: {"url": url, "ok": False, "last_ok": None, "last_error": None, "latency_ms": None}
+			for name, url in self.fixtures.items()
+		}
+		self.lock = threading.Lock()
+		self._stop_event = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	def start(self):
+		self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), daemon=True)
+		self._thread.start()
+		print(f"[Hub] Started with {len(self.fixtures)} fixtures.")
+
+	def stop(self):
+		self._stop_event.set()
+		if self._thread and self._thread.is_alive():
+			self._thread.join(timeout=self.poll_interval + self.timeout)
+		print("[Hub] Stopped.")
+
+	async def _run(self):
+		connector = aiohttp.TCPConnector(limit=0, limit_per_host=2, keepalive_timeout=30)
+		timeout = aiohttp.ClientTimeout(total=self.timeout)
+		async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+			while not self._stop_event.is_set():
+				started = time.monotonic()
+				await asyncio.gather(*(
+					self._fetch(session, name, url) for name, url in self.fixtures.items()
+				))
+				elapsed = time.monotonic() - started
+				await asyncio.sleep(max(0.0, self.poll_interval - elapsed))
+
+	async def _fetch(self, session, name: str, base_url: str):
+		status = self.fixture_status[name]
+		t0 = time.monotonic()
+		try:
+			async with session.get(base_url + "/api/data") as resp:
+				resp.raise_for_status()
+				payload = await resp.json()
+		except Exception as e:
+			with self.lock:
+				status["ok"] = False
+				status["last_error"] = f"{type(e).__name__}: {e}"
+			return
+		with self.lock:
+			self._merge(name, payload)
+			status["ok"] = True
+			status["last_ok"] = time.time()
+			status["latency_ms"] = round((time.monotonic() - t0) * 1000.0, 1)
+
+	def _merge(self, fixture: str, payload: Dict[str, Dict[str, object]]):
+		"""Append readings newer than each channel's last timestamp (caller holds the lock)."""
+		for sensor_id, entry in payload.items():
+			ts = _iso_to_epoch(entry.get("timestamp"))
+			if ts is None:
+				continue
+			key = f"{fixture}/{sensor_id}"
+			ch = self.channels.get(key)
+			if ch is None:
+				ch = self.channels[key] = _Channel(fixture, sensor_id)
+			ch.meta = {k: entry.get(k, "") for k in ("sensor_type", "sensor_label", "sensor_units", "sample_name")}
+			last = ch.last_ts()
+			if last is not None and ts <= last:
+				continue
+			ch.values.append(ts, _num(entry.get("sensor_value")))
+			ch.filtered.append(ts, _num(entry.get("filtered_value")))
+			# trim in steps so the tail copy happens once per max_points/4 readings
+			if ch.values.n > self.max_points + self.max_points // 4:
+				ch.values.keep_last(self.max_points)
+				ch.filtered.keep_last(self.max_points)
+
+	# ---------- same shapes as the single-fixture endpoints ----------
+	def _row_meta(self, ch: _Channel) -> Dict[str, object]:
+		return {
+			"fixture": ch.fixture,
+			"sensor_type": ch.meta.get("sensor_type", ""),
+			"sensor_label": f"{ch.fixture} {ch.meta.get('sensor_label') or ch.sensor_id}",
+			"sensor_units": ch.meta.get("sensor_units", ""),
+			"sample_name": ch.meta.get("sample_name", ""),
+		}
+
+	def get_latest_data(self) -> Dict[str, Dict[str, object]]:
+		"""Newest reading per fixture/sensor, formatted like /api/data."""
+		out = {}
+		with self.lock:
+			for key, ch in self.channels.items():
+				if not ch.values.n:
+					continue
+				out[key] = {
+					"sensor_value": _or_none(ch.values.v[-1]),
+					"filtered_value": _or_none(ch.filtered.v[-1]),
+					"timestamp": datetime.fromtimestamp(ch.last_ts(), tz=timezone.utc).isoformat(),
+					**self._row_meta(ch),
+				}
+		return out
+
+	def history(self) -> Tuple[np.ndarray, List[Dict[str, object]], List[str]]:
+		"""
+		All readings merged by time as history records, plus the sensors
+		table (one entry per channel, keyed "<fixture>/<sensor_id>") and the
+		samples table the records index into.
+		"""
+		with self.lock:
+			channels = list(self.channels.items())
+			cols = [(ch.values.t, ch.values.v, ch.filtered.v) for _, ch in channels]
+			sensors = [{"sensor_id": key, **self._row_meta(ch)} for key, ch in channels]
+		samples = sorted({s["sample_name"] for s in sensors})
+		recs = np.empty(sum(len(t) for t, _, _ in cols), dtype=RECORD_DTYPE)
+		pos = 0
+		for i, (t, v, f) in enumerate(cols):
+			end = pos + len(t)
+			recs["ts"][pos:end] = t
+			recs["value"][pos:end] = v
+			recs["filtered"][pos:end] = f
+			recs["sensor"][pos:end] = i
+			recs["sample"][pos:end] = samples.index(sensors[i]["sample_name"])
+			pos = end
+		recs = recs[np.argsort(recs["ts"], kind="stable")]
+		recs["ts_max"] = recs["ts"]
+		return recs, sensors, samples
+
+	def get_full_log(self) -> List[Dict[str, object]]:
+		"""All readings from every fixture merged by time, formatted like /api/history."""
+		recs, sensors, _ = self.history()
+		values = np.where(np.isnan(recs["value"]), None, recs["value"]).tolist()
+		filtered = np.where(np.isnan(recs["filtered"]), None, recs["filtered"]).tolist()
+		return [
+			{"timestamp": t, **sensors[s], "sensor_value": v, "filtered_value": f}
+			for t, s, v, f in zip(recs["ts"].tolist(), recs["sensor"].tolist(), values, filtered)
+		]
+
+	def series(self):
+		"""(key, meta, timestamps, values) per fixture/sensor for /api/chart, as array views."""
+		with self.lock:
+			return [(key, self._row_meta(ch), ch.values.t, ch.values.v)
+					for key, ch in self.channels.items()]
+
+	def status(self) -> Dict[str, Dict[str, object]]:
+		with self.lock:
+			return {name: dict(s) for name, s in self.fixture_status.items()}
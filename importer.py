@@ -0,0 +1,251 @@
+import argparse
+import csv
+import glob
+import itertools
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from history_store import HistoryStore
+from logger import DataLogger
+from run_exporter import EXPORT_FIELDNAMES, format_export_row
+
+# Column name -> accepted header names, first match wins.
+# Covers /api/export + manual_logger.NEW_FIELDNAMES ("new"), old DataLogger.export_csv
+# files and manual_logger *.v1_*.csv backups ("v1": timestamp + sensor_value/value).
+COLUMN_ALIASES = {
+	"ts": ("ts_epoch", "timestamp", "ts_utc"),
+	"sensor_id": ("sensor_id",),
+	"sensor_type": ("sensor_type",),
+	"sensor_label": ("sensor_label",),
+	"sensor_units": ("sensor_units",),
+	"sample_name": ("sample_name",),
+	"value": ("value", "sensor_value"),
+	"filtered_value": ("filtered_value",),
+}
+TEXT_COLUMNS = ("sensor_id", "sensor_type", "sensor_label", "sensor_units", "sample_name")
+CHUNK_ROWS = 100_000        # CSV records parsed per chunk
+
+
+def detect_schema(header: List[str]) -> Dict[str, Optional[int]]:
+	"""Map our column names to indexes in a CSV header; raises ValueError if time/id/value are missing."""
+	header = [h.strip() for h in header]
+	cols = {}
+	for name, aliases in COLUMN_ALIASES.items():
+		cols[name] = next((header.index(a) for a in aliases if a in header), None)
+	if cols["ts"] is None or cols["sensor_id"] is None or cols["value"] is None:
+		raise ValueError(f"unrecognized CSV header: {header}")
+	return cols
+
+
+def schema_name(header: List[str]) -> str:
+	return "new" if "ts_epoch" in header else "v1"
+
+
+def _to_float(col: np.ndarray) -> np.ndarray:
+	"""Vectorized str -> float with blanks/garbage as NaN."""
+	try:
+		return col.astype(np.float64)
+	except ValueError:
+		out = np.full(col.shape, np.nan)
+		for i, s in enumerate(col):
+			try:
+				out[i] = float(s)
+			except ValueError:
+				pass
+		return out
+
+
+def _iso_one(s: str) -> float:
+	try:
+		s = s.strip()
+		if s.endswith("Z"):
+			s = s[:-1] + "+00:00"
+		dt = datetime.fromisoformat(s)
+		if dt.tzinfo is None:
+			dt = dt.astimezone()
+		return dt.timestamp()
+	except ValueError:
+		return np.nan
+
+
+def _to_epoch(col: np.ndarray) -> np.ndarray:
+	"""Epoch seconds from a column of epoch strings or ISO-8601 UTC strings."""
+	try:
+		return col.astype(np.float64)
+	except ValueError:
+		pass
+	# ISO strings in UTC ('...Z' / '...+00:00') parse in one pass as datetime64
+	stripped = np.char.replace(np.char.replace(col, "+00:00", ""), "Z", "")
+	utc = np.char.endswith(col, "Z") | np.char.endswith(col, "+00:00")
+	if utc.all():
+		try:
+			us = stripped.astype("datetime64[us]").astype(np.int64)
+			return us / 1e6
+		except ValueError:
+			pass
+	return np.array([_iso_one(s) for s in col], dtype=np.float64)
+
+
+def read_csv_columns(path: str, chunk_rows: int = CHUNK_ROWS) -> Dict[str, np.ndarray]:
+	"""
+	Parse one CSV into columns: ts (float epoch), value/filtered_value (float,
+	NaN when blank) and the text columns as str arrays. Records are parsed
+	chunk_rows at a time, so only one chunk is ever held as Python lists.
+	"""
+	with open(path, "r", encoding="utf-8", newline="") as f:
+		reader = csv.reader(f)
+		header = next(reader, None)
+		if not header:
+			return empty_columns()
+		cols = detect_schema(header)
+		width = len(header)
+		chunks = []
+		while True:
+			records = list(itertools.islice(reader, chunk_rows))
+			if not records:
+				break
+			body = [r for r in records if len(r) >= width]
+			if body:
+				chunks.append(_chunk_columns(body, cols))
+	if not chunks:
+		return empty_columns()
+	return {k: np.concatenate([c[k] for c in chunks]) for k in chunks[0]}
+
+
+def _chunk_columns(body: List[List[str]], cols: Dict[str, Optional[int]]) -> Dict[str, np.ndarray]:
+	fields = list(zip(*body))
+	out: Dict[str, np.ndarray] = {}
+	for name in TEXT_COLUMNS:
+		idx = cols[name]
+		out[name] = np.array(fields[idx], dtype=str) if idx is not None else np.full(len(body), "", dtype=str)
+	out["ts"] = _to_epoch(np.array(fields[cols["ts"]], dtype=str))
+	out["value"] = _to_float(np.array(fields[cols["value"]], dtype=str))
+	idx = cols["filtered_value"]
+	# files without the column (v1, sensor_value-only) were never filtered: use the raw value,
+	# like DataLogger.log(); blank cells in files that have the column stay NaN
+	out["filtered_value"] = (_to_float(np.array(fields[idx], dtype=str)) if idx is not None
+							 else out["value"].copy())
+
+	keep = ~np.isnan(out["ts"]) & ~np.isnan(out["value"])
+	return {k: v[keep] for k, v in out.items()}
+
+
+def empty_columns() -> Dict[str, np.ndarray]:
+	out = {name: np.array([], dtype=str) for name in TEXT_COLUMNS}
+	out.update(ts=np.array([]), value=np.array([]), filtered_value=np.array([]))
+	return out
+
+
+def store_columns(store: HistoryStore, config) -> Dict[str, np.ndarray]:
+	"""Columns for the logger's current run, read straight from its history records."""
+	recs = store.records()
+	if not len(recs):
+		return empty_columns()
+	sensor = recs["sensor"]
+	out = {
+		name: np.array([s[name] for s in store.sensors], dtype=str)[sensor]
+		for name in ("sensor_id", "sensor_type", "sensor_label", "sensor_units")
+	}
+	names = np.array(list(config.sample_names) + [""], dtype=str)   # sample -1 -> ""
+	out["sample_name"] = names[recs["sample"]]
+	out["ts"] = recs["ts"].copy()
+	out["value"] = recs["value"].copy()
+	out["filtered_value"] = recs["filtered"].copy()
+	return out
+
+
+def sample_ids(cols: Dict[str, np.ndarray], config) -> np.ndarray:
+	"""Interned sample IDs for the sample_name column (one lookup per distinct name)."""
+	names, inverse = np.unique(cols["sample_name"], return_inverse=True)
+	return np.array([config.intern_sample(n) for n in names], dtype=np.int64)[inverse]
+
+
+def merge_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+	"""
+	Merge-sort column sets by (time, sensor_id) and drop duplicate readings.
+	Exports write ts_epoch with %.6f, so readings of one sensor less than
+	2 µs apart count as the same reading and only the first is kept; on
+	identical times the earliest part wins, so existing data beats re-imports.
+	"""
+	parts = [p for p in parts if len(p["ts"])]
+	if not parts:
+		return empty_columns()
+	merged = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+	us = np.round(merged["ts"] * 1e6).astype(np.int64)
+	sid = merged["sensor_id"]
+	# per sensor by time (stable: keeps part order on ties) to find duplicates...
+	order = np.lexsort((us, sid))
+	us_s, sid_s = us[order], sid[order]
+	dup = np.zeros(len(order), dtype=bool)
+	dup[1:] = (sid_s[1:] == sid_s[:-1]) & (us_s[1:] - us_s[:-1] <= 1)
+	keep = order[~dup]
+	# ...then back to (time, sensor_id) order
+	keep = keep[np.lexsort((sid[keep], us[keep]))]
+	return {k: v[keep] for k, v in merged.items()}
+
+
+def columns_to_rows(cols: Dict[str, np.ndarray], config) -> List[Dict[str, object]]:
+	"""Build DataLogger rows; sample names are interned once per distinct name."""
+	ids = sample_ids(cols, config)
+	filtered = cols["filtered_value"]
+	filtered = np.where(np.isnan(filtered), None, filtered)
+	keys = ("timestamp", "sensor_id", "sensor_type", "sensor_label", "sensor_units",
+			"sample_id", "sensor_value", "filtered_value")
+	return [
+		dict(zip(keys, vals))
+		for vals in zip(
+			cols["ts"].tolist(), cols["sensor_id"].tolist(), cols["sensor_type"].tolist(),
+			cols["sensor_label"].tolist(), cols["sensor_units"].tolist(), ids.tolist(),
+			cols["value"].tolist(), filtered.tolist(),
+		)
+	]
+
+
+def import_into(logger: DataLogger, paths: List[str], merge: bool = True) -> Dict[str, object]:
+	"""
+	Import CSV files into the logger as a new run (merged with the current
+	run's rows when merge is True). Returns counts per file and overall.
+	"""
+	t0 = time.time()
+	parts = [store_columns(logger.data, logger.config)] if merge else []
+	files = {}
+	for path in paths:
+		cols = read_csv_columns(path)
+		with open(path, "r", encoding="utf-8", newline="") as f:
+			header = next(csv.reader(f), [])
+		files[os.path.basename(path)] = {"schema": schema_name(header), "rows": int(len(cols["ts"]))}
+		parts.append(cols)
+	merged = merge_columns(parts)
+	merged["sample_id"] = sample_ids(merged, logger.config)
+	logger.load_columns(merged)
+	return {"files": files, "rows": int(len(merged["ts"])), "seconds": round(time.time() - t0, 3)}
+
+
+def write_csv(cols: Dict[str, np.ndarray], path: str, config) -> int:
+	"""Write merged columns in the /api/export layout."""
+	rows = columns_to_rows(cols, config)
+	with open(path, "w", encoding="utf-8", newline="") as f:
+		writer = csv.writer(f)
+		writer.writerow(EXPORT_FIELDNAMES)
+		for row in rows:
+			writer.writerow(format_export_row(row, float, config.row_sample_name(row)))
+	return len(rows)
+
+
+if __name__ == "__main__":
+	from sensor_config import sensor_config
+
+	parser = argparse.ArgumentParser(description="Merge legacy/new HDT CSV logs into one time-sorted file.")
+	parser.add_argument("inputs", nargs="+", help="CSV files or glob patterns (e.g. 'exports/*.csv')")
+	parser.add_argument("-o", "--output", default=os.path.join("exports", "merged.csv"))
+	args = parser.parse_args()
+
+	paths = sorted({p for pattern in args.inputs for p in (glob.glob(pattern) or [pattern])})
+	started = time.time()
+	merged = merge_columns([read_csv_columns(p) for p in paths])
+	n = write_csv(merged, args.output, sensor_config)
+	print(f"[Importer] {len(paths)} files -> {n} rows in {args.output} ({time.time() - started:.2f}s)")
@@ -1,52 +1,82 @@
 import os
 import csv
+import time
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from sensor_config import sensor_config
+from history_store import HistoryStore
 
 
 
 class DataLogger:
-	def __init__(self, config: Dict[str, Dict[str, str]]):
+	def __init__(self, config: Dict[str, Dict[str, str]], history_dir: Optional[str] = None):
 		"""
 		Initialize the data logger with a sensor configuration.
 
 		:param config: Dict of sensor metadata keyed by sensor ID
+		:param history_dir: Where run history files go (default: $HISTORY_DIR or ./history)
 		"""
 		self.logging: bool = False
-		self.data: List[Dict[str, str]] = []
+		# rows live on disk (mmap-ed fixed records); reads look like a list of dicts
+		self.data: HistoryStore = HistoryStore(history_dir)
 		self.config = config
+		self.run_id: int = 0
+		self.run_started: Optional[float] = None
 
 	def start(self):
 		"""Start logging and clear any previous data."""
 		self.logging = True
-		self.data.clear()
+		self.run_id += 1
+		self.run_started = time.time()
+		self.data.new_run(self.run_started)
 
 	def stop(self):
 		"""Stop logging."""
 		self.logging = False
 
+	def load_rows(self, rows: List[Dict[str, object]]):
+		"""Replace the log with pre-built rows (e.g. a bulk import) as a new run."""
+		self.run_id += 1
+		self.run_started = rows[0]['timestamp'] if rows else time.time()
+		self.data.new_run(self.run_started)
+		self.data.extend(rows)
+
+	def load_columns(self, cols):
+		"""Like load_rows(), from importer columns written straight to the run file."""
+		self.run_id += 1
+		self.run_started = float(cols['ts'][0]) if len(cols['ts']) else time.time()
+		self.data.new_run(self.run_started)
+		self.data.extend_columns(cols)
+
 	def is_logging(self) -> bool:
 		return self.logging
 		
 	def log(self, sensor_data):
 		"""
-		sensor_data: dict of {sensor_id: {'sensor_value': float, 'timestamp': float}}
+		sensor_data: dict of {sensor_id: {'sensor_value': float, 'timestamp': float,
+		                                  'filtered_value': float (optional),
+		                                  'sample_name': str (optional)}}
 		"""
 		if not self.logging:
 			return
 		
+		rows = []
 		for sensor_id, info in sensor_data.items():
-			self.data.append({
+			rows.append({
 				# 'timestamp': datetime.now(timezone.utc).isoformat(),
 				'timestamp': info.get('timestamp') or time.time(),  # store epoch float
 				'sensor_id': sensor_id,
 				'sensor_type': self.config.get_sensor_type(sensor_id),
 				'sensor_label': self.config.get_sensor_label(sensor_id),
 				'sensor_units': self.config.get_sensor_units(sensor_id),
-				'sample_name': self.config.get_sample_name(sensor_id),
-				'sensor_value': info.get('sensor_value')
+				# replayed/imported readings may carry their own sample name
+				'sample_id': (self.config.intern_sample(info['sample_name']) if 'sample_name' in info
+							  else self.config.get_sample_id(sensor_id)),
+				'sensor_value': info.get('sensor_value'),
+				# unfiltered sources pass through; None means the filter rejected the reading
+				'filtered_value': info.get('filtered_value', info.get('sensor_value'))
 			})
+		self.data.extend(rows)
 
 
 	def export_csv(self, output_dir: str = 'exports') -> str | None:
@@ -76,15 +106,51 @@ class DataLogger:
 				'sensor_label',
 				'sensor_units',
 				'sample_name',
-				'sensor_value'
-			])
+				'sensor_value',
+				'filtered_value'
+			], extrasaction='ignore')
 			writer.writeheader()
-			writer.writerows(self.data)
+			for row in self.data:
+				writer.writerow({**row, 'sample_name': self.config.row_sample_name(row)})
 
 		print(f"[Logger] Exported {len(self.data)} rows to {filename}")
 		return filename
 		
-	def get_full_log(self) -> List[Dict[str, str]]:
-		"""Return the full logged dataset as a list of dicts."""
+	def get_full_log(self) -> HistoryStore:
+		"""Return the full logged dataset (a sequence of row dicts backed by the run file)."""
 		return self.data
 
+	def latest_rows(self) -> Dict[str, Dict[str, object]]:
+		"""Newest logged row per sensor ID."""
+		return self.data.latest_per_sensor()
+
+
+class LogCursor:
+	"""
+	Remembers how far a consumer has read into the current DataLogger run,
+	so exports/analysis only touch rows added since the last call.
+	"""
+
+	def __init__(self, logger: DataLogger):
+		self.logger = logger
+		self.run_id: Optional[int] = None
+		self.offset: int = 0
+
+	def new_range(self) -> Tuple[bool, int, int]:
+		"""
+		Return (reset, lo, hi): the index range of rows not yet seen. reset is
+		True when a new run started (or the log was cleared) since the last call.
+		"""
+		n = len(self.logger.data)
+		reset = False
+		if self.run_id != self.logger.run_id or n < self.offset:
+			self.run_id = self.logger.run_id
+			self.offset = 0
+			reset = True
+		lo, self.offset = self.offset, n
+		return reset, lo, n
+
+	def new_rows(self) -> Tuple[bool, List[Dict[str, str]]]:
+		"""Like new_range(), but returns the unseen rows as dicts."""
+		reset, lo, hi = self.new_range()
+		return reset, self.logger.data[lo:hi]
@@ -0,0 +1,205 @@
+import csv
+import mmap
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Accepted column names, first match wins (export / NEW_FIELDNAMES first, then legacy)
+TIME_COLUMNS = ("ts_epoch", "timestamp")
+VALUE_COLUMNS = ("value", "sensor_value")
+
+
+def iter_csv_records(path: str, chunk_size: int = 1 << 20) -> Iterator[List[str]]:
+	"""
+	Yield CSV records (header first) from a memory-mapped file, decoding
+	chunk_size bytes at a time on line boundaries.
+	"""
+	with open(path, "rb") as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			return
+		with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+			size = len(mm)
+			pos = 0
+			while pos < size:
+				end = min(pos + chunk_size, size)
+				if end < size:
+					nl = mm.rfind(b"\n", pos, end)
+					if nl == -1:
+						nl = mm.find(b"\n", end)
+					end = size if nl == -1 else nl + 1
+				lines = mm[pos:end].decode("utf-8").splitlines()
+				pos = end
+				yield from csv.reader(lines)
+
+
+def _pick(header: List[str], names) -> Optional[int]:
+	for name in names:
+		if name in header:
+			return header.index(name)
+	return None
+
+
+def _parse_ts(s: str) -> Optional[float]:
+	try:
+		return float(s)
+	except ValueError:
+		pass
+	try:
+		s = s.strip()
+		if s.endswith("Z"):
+			s = s[:-1] + "+00:00"
+		dt = datetime.fromisoformat(s)
+		if dt.tzinfo is None:
+			dt = dt.astimezone()
+		return dt.timestamp()
+	except ValueError:
+		return None
+
+
+class CsvReplaySource:
+	def __init__(self, path: str, speed: float = 1.0, rebase: bool = True,
+				 chunk_size: int = 1 << 20):
+		"""
+		Streams a recorded CSV (exports/log_*.csv, manual_logger NEW_FIELDNAMES,
+		or legacy timestamp/sensor_value files) into a DataEngine in place of
+		the live poller.
+
+		:param path: CSV file to replay
+		:param speed: Playback factor (1.0 = real time); 0 or inf = as fast as possible
+		:param rebase: Shift timestamps so the recording starts "now" (intervals preserved)
+		:param chunk_size: Bytes decoded per chunk from the memory map
+		"""
+		self.path = path
+		self.speed = speed
+		self.rebase = rebase
+		self.chunk_size = chunk_size
+		self.data: Dict[str, Dict[str, float]] = {}
+		self.lock = threading.Lock()
+		self.rows_replayed = 0
+		self.elapsed = 0.0
+		self.done = threading.Event()
+		self._ingest: Optional[Callable] = None
+		self._stop_event = threading.Event()
+		self._play = threading.Event()
+		self.thread = threading.Thread(target=self._run, daemon=True)
+
+	# ---------- poller-compatible interface ----------
+	def bind(self, ingest: Callable):
+		"""Called by DataEngine: ingest(sensor_data, apply_filters=bool) receives each batch."""
+		self._ingest = ingest
+
+	def start(self):
+		self.thread.start()
+
+	def play(self):
+		"""
+		Called by DataEngine.start_logging(): playback waits for this so no
+		rows are dropped, and each later call replays the file from the start.
+		"""
+		self.done.clear()
+		self._play.set()
+
+	def stop(self):
+		self._stop_event.set()
+		self._play.set()
+		if self.thread.is_alive():
+			self.thread.join()
+
+	def get_data(self):
+		with self.lock:
+			return self.data.copy()
+
+	def rows_per_second(self) -> float:
+		return self.rows_replayed / self.elapsed if self.elapsed else 0.0
+
+	# ---------- playback ----------
+	def _batches(self):
+		"""Yield (ts, [(sensor_id, sensor_type, sample_name, value)]) grouped by timestamp."""
+		records = iter_csv_records(self.path, self.chunk_size)
+		header = [h.strip() for h in next(records, [])]
+		t_col = _pick(header, TIME_COLUMNS)
+		v_col = _pick(header, VALUE_COLUMNS)
+		if t_col is None or v_col is None or "sensor_id" not in header:
+			raise ValueError(f"{self.path}: unrecognized CSV header {header}")
+		id_col = header.index("sensor_id")
+		type_col = _pick(header, ("sensor_type",))
+		sample_col = _pick(header, ("sample_name",))
+		width = len(header)
+
+		batch_ts, batch = None, []
+		for rec in records:
+			if len(rec) < width:
+				continue
+			ts = _parse_ts(rec[t_col])
+			try:
+				value = float(rec[v_col])
+			except ValueError:
+				continue
+			if ts is None:
+				continue
+			if ts != batch_ts and batch:
+				yield batch_ts, batch
+				batch = []
+			batch_ts = ts
+			batch.append((
+				rec[id_col],
+				rec[type_col] if type_col is not None else "",
+				rec[sample_col] if sample_col is not None else None,
+				value,
+			))
+		if batch:
+			yield batch_ts, batch
+
+	def _run(self):
+		# the logger drops rows until logging starts, so hold playback until then;
+		# every later play() replays the file from the top (mid-playback too)
+		while True:
+			self._play.wait()
+			if self._stop_event.is_set():
+				self.done.set()
+				return
+			self._play.clear()
+			self._playback()
+
+	def _playback(self):
+		fast = not self.speed or self.speed == float("inf")
+		wall0 = time.time()
+		ts0 = None
+		self.rows_replayed = 0
+		try:
+			for ts, batch in self._batches():
+				# _play is set again by stop() or by a new play() (restart)
+				if self._play.is_set():
+					break
+				if ts0 is None:
+					ts0 = ts
+				if not fast:
+					delay = wall0 + (ts - ts0) / self.speed - time.time()
+					if delay > 0.001 and self._play.wait(delay):
+						break
+				out_ts = ts + (wall0 - ts0) if self.rebase else ts
+
+				# temperatures go through the engine's filters like live readings;
+				# dial rows are logged as-is, like manual entries
+				temps, other = {}, {}
+				for sensor_id, stype, sample_name, value in batch:
+					info = {"sensor_value": value, "timestamp": out_ts}
+					if sample_name is not None:
+						info["sample_name"] = sample_name
+					(temps if stype in ("temperature", "") else other)[sensor_id] = info
+				if temps:
+					with self.lock:
+						self.data.update(temps)
+				if self._ingest is not None:
+					if temps:
+						self._ingest(temps, apply_filters=True)
+					if other:
+						self._ingest(other, apply_filters=False)
+				self.rows_replayed += len(batch)
+		finally:
+			self.elapsed = time.time() - wall0
+			self.done.set()
+			print(f"[Replay] {self.rows_replayed} rows from {self.path} "
+				  f"in {self.elapsed:.2f}s ({self.rows_per_second():.0f} rows/s).")
@@ -0,0 +1,109 @@
+import csv
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from history_store import ITER_CHUNK
+from logger import DataLogger, LogCursor
+
+# Column order of /api/export files (manual_logger.NEW_FIELDNAMES + filtered channel)
+EXPORT_FIELDNAMES: List[str] = [
+	"ts_epoch", "ts_utc", "ts_local",
+	"sensor_id", "sensor_type", "sensor_label", "sensor_units",
+	"sample_name", "value", "filtered_value",
+]
+
+
+def format_export_row(row: Dict[str, object], to_epoch, sample_name: str = "") -> Optional[List[object]]:
+	"""Map one in-memory log row to an export CSV row, or None if its timestamp is malformed."""
+	ts_epoch = to_epoch(row.get("timestamp"))
+	if ts_epoch is None:
+		return None
+
+	dt_utc = datetime.fromtimestamp(ts_epoch, tz=timezone.utc)
+	ts_utc = dt_utc.isoformat()
+	ts_local = dt_utc.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+
+	value = row.get("sensor_value", row.get("value", ""))
+	filtered = row.get("filtered_value")
+
+	return [
+		f"{ts_epoch:.6f}", ts_utc, ts_local,
+		row.get("sensor_id", ""),
+		row.get("sensor_type", ""),
+		row.get("sensor_label", ""),
+		row.get("sensor_units", ""),
+		sample_name,
+		value,
+		"" if filtered is None else filtered,
+	]
+
+
+class RunExporter:
+	def __init__(self, logger: DataLogger, to_epoch, export_dir: str = "exports"):
+		"""
+		Keeps one CSV per logging run and appends only the rows added since
+		the previous export, so export cost scales with new data.
+
+		:param logger: DataLogger whose run is exported
+		:param to_epoch: Callable normalizing a row timestamp to epoch seconds (or None)
+		:param export_dir: Directory the per-run CSV files are written to
+		"""
+		self.cursor = LogCursor(logger)
+		self.to_epoch = to_epoch
+		self.export_dir = export_dir
+		self.path: Optional[str] = None
+		self.rows_written: int = 0
+		self._lock = threading.Lock()
+
+	def _new_file(self):
+		started = self.cursor.logger.run_started
+		dt = datetime.fromtimestamp(started, tz=timezone.utc) if started else datetime.now(timezone.utc)
+		os.makedirs(self.export_dir, exist_ok=True)
+		stem = os.path.join(self.export_dir, "log_" + dt.strftime("%Y%m%d_%H%M%S"))
+		# never overwrite an existing file (e.g. the export a run was imported from)
+		i = 1
+		while True:
+			path = stem + (f"_{i}" if i > 1 else "") + ".csv"
+			try:
+				f = open(path, "x", encoding="utf-8", newline="")
+				break
+			except FileExistsError:
+				i += 1
+		with f:
+			csv.writer(f).writerow(EXPORT_FIELDNAMES)
+		self.path = path
+		self.rows_written = 0
+
+	def export(self) -> Optional[str]:
+		"""
+		Bring the run's CSV up to date and return its path.
+		Returns None if the run has no valid rows yet.
+		"""
+		with self._lock:
+			reset, lo, hi = self.cursor.new_range()
+			if reset or self.path is None or not os.path.exists(self.path):
+				if not reset:
+					# file vanished under us: rewrite the whole run
+					lo = 0
+				self._new_file()
+
+			if hi > lo:
+				config = self.cursor.logger.config
+				store = self.cursor.logger.data
+				with open(self.path, "a", encoding="utf-8", newline="") as f:
+					writer = csv.writer(f)
+					# ITER_CHUNK records at a time, so a long run is never held as dicts
+					for a in range(lo, hi, ITER_CHUNK):
+						for row in store.to_rows(store.records(a, min(a + ITER_CHUNK, hi))):
+							out = format_export_row(row, self.to_epoch, config.row_sample_name(row))
+							if out is None:
+								# skip malformed timestamps
+								continue
+							writer.writerow(out)
+							self.rows_written += 1
+
+			if self.rows_written == 0:
+				return None
+			return self.path
@@ -1,45 +1,70 @@
+import json
+import os
+import threading
+from typing import Dict, List
+
+STATIONS_PATH = os.path.join("config", "stations.json")
+
+# Sample slot -> sensors that measure that sample. Override with config/stations.json:
+# {"stations": [{"slot": "sample1", "label": "Sample 1", "sensors": [...], "manual_dial": "..."}]}
+DEFAULT_STATIONS = [
+	{
+		"slot": "sample1",
+		"label": "Sample 1",
+		"sensors": ["28-000008ae0bbd", "usb-dial-001", "dial_1_manual_entry"],
+		"manual_dial": "dial_1_manual_entry",
+	},
+	{
+		"slot": "sample2",
+		"label": "Sample 2",
+		"sensors": ["28-000008ae5436", "usb-dial-002", "dial_2_manual_entry"],
+		"manual_dial": "dial_2_manual_entry",
+	},
+]
+
+
 class SensorConfig:
-	def __init__(self):
+	def __init__(self, stations_path: str = STATIONS_PATH):
 		self.mapping = {
 			"28-000008ae0bbd": {
 				"sensor_label": "Temp #1",
 				"sensor_type": "temperature",
-				"sensor_units": "°C",
-				"sample_name": "HDPE-testtest"
+				"sensor_units": "°C"
 			},
 			"28-000008ae5436": {
 				"sensor_label": "Temp #2",
 				"sensor_type": "temperature",
-				"sensor_units": "°C",
-				"sample_name": "PHA-testtest"
+				"sensor_units": "°C"
 			},
 			"usb-dial-001": {
 				"sensor_label": "Dial #1",
 				"sensor_type": "dial",
-				"sensor_units": "mm",
-				"sample_name": "HDPE"
+				"sensor_units": "mm"
 			},
 			"usb-dial-002": {
 				"sensor_label": "Dial #2",
 				"sensor_type": "dial",
-				"sensor_units": "mm",
-				"sample_name": "PHA"
+				"sensor_units": "mm"
 			},
 			# ---- Manual entry sensors (virtual) ----
 			"dial_1_manual_entry": {
 				"sensor_label": "Manual Dial 1",
 				"sensor_type": "dial_indicator",
-				"sensor_units": "mm",
-				"sample_name": ""   # set at /api/start
+				"sensor_units": "mm"
 			},
 			"dial_2_manual_entry": {
 				"sensor_label": "Manual Dial 2",
 				"sensor_type": "dial_indicator",
-				"sensor_units": "mm",
-				"sample_name": ""   # set at /api/start
+				"sensor_units": "mm"
 			}
 		}
 
+		# Sample names are interned once; log rows carry the integer sample ID
+		self.sample_names: List[str] = [""]
+		self._sample_ids: Dict[str, int] = {"": 0}
+		self._lock = threading.Lock()
+		self.load_stations(stations_path)
+
 	def get_sensor_type(self, sensor_id):
 		return self.mapping.get(sensor_id, {}).get("sensor_type", "unknown")
 
@@ -49,8 +74,84 @@ class SensorConfig:
 	def get_sensor_units(self, sensor_id):
 		return self.mapping.get(sensor_id, {}).get("sensor_units", "")
 
+	# ---------- stations ----------
+	def load_stations(self, path: str = STATIONS_PATH):
+		"""Load station definitions and rebuild the slot/sensor indexes."""
+		try:
+			with open(path, "r", encoding="utf-8") as f:
+				stations = json.load(f).get("stations") or DEFAULT_STATIONS
+		except (FileNotFoundError, ValueError):
+			stations = DEFAULT_STATIONS
+
+		self.stations: List[Dict[str, object]] = [
+			{
+				"slot": st["slot"],
+				"label": st.get("label") or st["slot"],
+				"sensors": list(st.get("sensors") or []),
+				"manual_dial": st.get("manual_dial"),
+			}
+			for st in stations
+		]
+		self.slots: List[str] = [st["slot"] for st in self.stations]
+		self.slot_index: Dict[str, int] = {slot: i for i, slot in enumerate(self.slots)}
+		self.sensor_station: Dict[str, int] = {
+			sid: i for i, st in enumerate(self.stations) for sid in st["sensors"]
+		}
+		# current sample ID per station; replaced as a whole so readers never see a half-update
+		self.station_sample = (0,) * len(self.stations)
+
+	def manual_dials(self) -> Dict[str, str]:
+		"""Manual-entry key -> sensor: dial_N is the manual dial of station N (1-based)."""
+		return {f"dial_{i + 1}": st["manual_dial"] for i, st in enumerate(self.stations) if st["manual_dial"]}
+
+	def intern_sample(self, name: str) -> int:
+		"""Return the integer ID for a sample name, allocating one if new."""
+		name = (name or "").strip()
+		sid = self._sample_ids.get(name)
+		if sid is None:
+			with self._lock:
+				sid = self._sample_ids.get(name)
+				if sid is None:
+					sid = len(self.sample_names)
+					self.sample_names.append(name)
+					self._sample_ids[name] = sid
+		return sid
+
+	def sample_id_for(self, name: str):
+		"""Integer ID of an already-known sample name, or None."""
+		return self._sample_ids.get((name or "").strip())
+
+	def assign_samples(self, names: Dict[str, str]):
+		"""Set the sample on each station slot in one step (unlisted slots are cleared)."""
+		self.station_sample = tuple(self.intern_sample(names.get(slot, "")) for slot in self.slots)
+
+	def clear_samples(self):
+		self.station_sample = (0,) * len(self.stations)
+
+	def active_samples(self) -> Dict[str, str]:
+		"""Slot -> currently assigned sample name."""
+		current = self.station_sample
+		return {slot: self.sample_names[current[i]] for i, slot in enumerate(self.slots)}
+
+	def get_sample_id(self, sensor_id) -> int:
+		station = self.sensor_station.get(sensor_id)
+		return 0 if station is None else self.station_sample[station]
+
+	def sample_name_for(self, sample_id) -> str:
+		try:
+			return self.sample_names[sample_id]
+		except (IndexError, TypeError):
+			return ""
+
 	def get_sample_name(self, sensor_id):
-		return self.mapping.get(sensor_id, {}).get("sample_name", "")
+		return self.sample_names[self.get_sample_id(sensor_id)]
+
+	def row_sample_name(self, row) -> str:
+		"""Sample name of a log row (rows carry sample_id; imported/legacy rows may carry sample_name)."""
+		if "sample_name" in row:
+			return row.get("sample_name") or ""
+		return self.sample_name_for(row.get("sample_id", 0))
+
 
 # ✅ create an instance
 sensor_config = SensorConfig()
@@ -1,17 +1,106 @@
 import os
 import glob
+import math
 import threading
 import time
 
+# DS18B20 conversion time per resolution (bits -> seconds)
+CONVERSION_TIME = {9: 0.09375, 10: 0.1875, 11: 0.375, 12: 0.75}
+IDLE_RESOLUTION = 10        # ambient/idle: 0.125 °C steps, ~188 ms per conversion
+LOGGING_RESOLUTION = 12     # during a run: 0.0625 °C steps, ~750 ms per conversion
+BUS_BUDGET = 0.9            # fraction of each poll period the 1-Wire bus may be busy
+
+# Per-probe health: failing probes back off, then drop out of the schedule
+QUARANTINE_AFTER = 5        # consecutive failures before a probe is quarantined
+BACKOFF_MAX = 30.0          # seconds; cap on the retry delay, and the quarantine retry period
+REINSTATE_AFTER = 3         # consecutive good reads before a quarantined probe is rescheduled
+ERROR_RATE_ALPHA = 0.05     # EWMA weight of each read in error_rate
+
+
+class SensorHealth:
+	def __init__(self, base_delay: float = 1.0):
+		"""
+		Read health of one probe. Failures double the retry delay from
+		base_delay up to BACKOFF_MAX; after QUARANTINE_AFTER in a row the probe
+		is only retried every BACKOFF_MAX seconds until REINSTATE_AFTER good reads.
+		"""
+		self.base_delay = base_delay
+		self.state = 'ok'                       # 'ok' | 'backoff' | 'quarantined'
+		self.consecutive_failures = 0
+		self.consecutive_successes = 0
+		self.reads = 0
+		self.failures = 0
+		self.error_rate = 0.0
+		self.last_good = None                   # epoch seconds
+		self.last_error = None
+		self.next_attempt = 0.0                 # time.monotonic()
+
+	def record_success(self, now):
+		"""Returns True if the probe was just reinstated."""
+		self._count(False)
+		self.consecutive_failures = 0
+		self.consecutive_successes += 1
+		self.last_good = time.time()
+		if self.state == 'quarantined' and self.consecutive_successes < REINSTATE_AFTER:
+			self.next_attempt = now + self.base_delay
+			return False
+		reinstated = self.state == 'quarantined'
+		self.state = 'ok'
+		self.next_attempt = 0.0
+		return reinstated
+
+	def record_failure(self, now, error):
+		"""Returns True if the probe was just quarantined."""
+		self._count(True)
+		self.consecutive_successes = 0
+		self.consecutive_failures += 1
+		self.last_error = error
+		if self.state == 'quarantined' or self.consecutive_failures >= QUARANTINE_AFTER:
+			quarantined = self.state != 'quarantined'
+			self.state = 'quarantined'
+			self.next_attempt = now + BACKOFF_MAX
+			return quarantined
+		self.state = 'backoff'
+		delay = self.base_delay * 2 ** (self.consecutive_failures - 1)
+		self.next_attempt = now + min(delay, BACKOFF_MAX)
+		return False
+
+	def _count(self, failed):
+		self.reads += 1
+		self.failures += failed
+		self.error_rate += (float(failed) - self.error_rate) * ERROR_RATE_ALPHA
+
+	def as_dict(self):
+		return {
+			'state': self.state,
+			'consecutive_failures': self.consecutive_failures,
+			'last_good': self.last_good,
+			'error_rate': round(self.error_rate, 3),
+			'reads': self.reads,
+			'failures': self.failures,
+			'last_error': self.last_error,
+		}
+
+
 class TemperatureSensorPoller:
-	def __init__(self):
-		self.base_dir = '/sys/bus/w1/devices/'
+	def __init__(self, poll_interval: float = 1.0, idle_resolution: int = IDLE_RESOLUTION,
+				 base_dir: str = '/sys/bus/w1/devices/'):
+		self.base_dir = base_dir
 		self.sensors = self._discover_sensors()
 		self.data = {}
 		self.lock = threading.Lock()
 		self._stop_event = threading.Event()
 		self.thread = threading.Thread(target=self._poll_loop)
 
+		self.poll_interval = poll_interval
+		self.idle_resolution = idle_resolution
+		self.target_resolution = idle_resolution
+		self.resolution = {}        # sensor_path -> bits currently configured
+		self._applied_target = None
+		self._slots = [list(self.sensors)]
+		self._warned_readonly = False
+		self.health = {p: SensorHealth(poll_interval) for p in self.sensors}
+
 	def _discover_sensors(self):
 		return glob.glob(self.base_dir + '28-*')
 
@@ -33,18 +122,145 @@ class TemperatureSensorPoller:
 				return None
 		return None
 
+	def _read_probe(self, sensor_path):
+		"""(temp_c, None) on a good read, (None, reason) otherwise; never raises."""
+		try:
+			temp_c = self._read_temp(sensor_path)
+		except (OSError, IndexError) as e:
+			return None, f"{type(e).__name__}: {e}"
+		if temp_c is None:
+			return None, 'CRC check failed or no reading'
+		return temp_c, None
+
+	def _update_health(self, sensor_path, temp_c, error, now):
+		"""Record a read result; reschedules when a probe is quarantined or reinstated."""
+		health = self.health[sensor_path]
+		sensor_id = os.path.basename(sensor_path)
+		if error is None:
+			changed = health.record_success(now)
+			if changed:
+				print(f"[TempPoller] {sensor_id} reinstated.")
+				with self.lock:
+					self.resolution.pop(sensor_path, None)   # re-check bits on the next sweep
+		else:
+			changed = health.record_failure(now, error)
+			if changed:
+				print(f"[TempPoller] {sensor_id} quarantined after "
+					  f"{health.consecutive_failures} failed reads ({error}).")
+				with self.lock:
+					self.data.pop(sensor_id, None)   # don't serve a stale reading
+		if changed:
+			self._schedule()
+
+	def get_health(self):
+		"""Sensor ID -> health state, failure counts, error rate and last good read (epoch)."""
+		with self.lock:
+			return {os.path.basename(p): h.as_dict() for p, h in self.health.items()}
+
+	# ---------- resolution management ----------
+	def _read_resolution(self, sensor_path):
+		"""Bits from the w1_therm 'resolution' attribute; assume 12 if unavailable."""
+		try:
+			with open(sensor_path + '/resolution', 'r') as f:
+				return int(f.read().strip())
+		except (OSError, ValueError):
+			return 12
+
+	def _write_resolution(self, sensor_path, bits):
+		try:
+			with open(sensor_path + '/resolution', 'w') as f:
+				f.write(str(bits))
+			return True
+		except OSError as e:
+			if not self._warned_readonly:
+				print(f"[TempPoller] cannot set resolution ({e}); keeping current settings.")
+				self._warned_readonly = True
+			return False
+
+	def set_high_resolution(self, enabled: bool):
+		"""Request 12-bit conversions (logging) or the idle resolution; applied by the poll thread."""
+		self.target_resolution = LOGGING_RESOLUTION if enabled else self.idle_resolution
+
+	def _apply_resolution(self, target):
+		"""Bring every probe to the target resolution and rebuild the schedule if anything changed."""
+		changed = False
+		for sensor_path in self.sensors:
+			current = self.resolution.get(sensor_path)
+			if current is None:
+				current = self._read_resolution(sensor_path)
+			if current != target and self._write_resolution(sensor_path, target):
+				current = self._read_resolution(sensor_path)
+			if self.resolution.get(sensor_path) != current:
+				with self.lock:
+					self.resolution[sensor_path] = current
+				changed = True
+		if changed:
+			self._schedule()
+
+	def _schedule(self):
+		"""
+		Split probes into conversion slots so each sweep keeps the bus busy
+		for at most BUS_BUDGET of the poll period. Slots are filled longest
+		conversion first into the least-loaded slot; each sweep reads one slot.
+		Quarantined probes are left out so they cost the others no bus time.
+		"""
+		active = [p for p in self.sensors if self.health[p].state != 'quarantined']
+		conv = {p: CONVERSION_TIME.get(self.resolution.get(p, 12), 0.75) for p in active}
+		budget = self.poll_interval * BUS_BUDGET
+		n_slots = max(1, math.ceil(sum(conv.values()) / budget))
+		slots = [[] for _ in range(n_slots)]
+		load = [0.0] * n_slots
+		for path in sorted(active, key=lambda p: -conv[p]):
+			i = load.index(min(load))
+			slots[i].append(path)
+			load[i] += conv[path]
+		with self.lock:
+			self._slots = slots
+
+	def get_resolution(self):
+		"""Sensor ID -> configured bits and read period in seconds."""
+		# the poll thread updates both under the lock; snapshot them together
+		with self.lock:
+			n_slots = len(self._slots)
+			resolution = dict(self.resolution)
+		return {
+			os.path.basename(p): {'bits': bits, 'period_s': self.poll_interval * n_slots}
+			for p, bits in resolution.items()
+		}
+
 	def _poll_loop(self):
+		sweep = 0
 		while not self._stop_event.is_set():
+			started = time.monotonic()
+			target = self.target_resolution
+			if target != self._applied_target or self.resolution.keys() != set(self.sensors):
+				self._apply_resolution(target)
+				self._applied_target = target
+
+			# Read this sweep's slot outside the lock so get_data() never waits on the bus.
+			# Probes in backoff are skipped until due; at most one quarantined probe
+			# is retried per sweep.
+			now = time.monotonic()
+			due = [p for p in self._slots[sweep % len(self._slots)] if now >= self.health[p].next_attempt]
+			retry = next((p for p in self.sensors if self.health[p].state == 'quarantined'
+						  and now >= self.health[p].next_attempt), None)
+			if retry is not None:
+				due.append(retry)
+			readings = {}
+			for sensor_path in due:
+				temp_c, error = self._read_probe(sensor_path)
+				self._update_health(sensor_path, temp_c, error, time.monotonic())
+				# a quarantined probe's good retries aren't served until it is reinstated
+				if temp_c is not None and self.health[sensor_path].state != 'quarantined':
+					readings[os.path.basename(sensor_path)] = {
+						'sensor_value': temp_c,              # ✅ updated key
+						'timestamp': time.time()
+					}
 			with self.lock:
-				for sensor_path in self.sensors:
-					sensor_id = os.path.basename(sensor_path)
-					temp_c = self._read_temp(sensor_path)
-					if temp_c is not None:
-						self.data[sensor_id] = {
-							'sensor_value': temp_c,              # ✅ updated key
-							'timestamp': time.time()
-						}
-			time.sleep(1)  # polling rate
+				self.data.update(readings)
+			sweep += 1
+			# polling rate
+			self._stop_event.wait(max(0.0, self.poll_interval - (time.monotonic() - started)))
 
 	def start(self):
 		self.thread.start()
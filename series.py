@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class Series:
+	"""Growable columnar (time, value) buffer backed by NumPy arrays."""
+
+	def __init__(self, capacity: int = 1024):
+		self._t = np.empty(capacity, dtype=np.float64)
+		self._v = np.empty(capacity, dtype=np.float64)
+		self.n = 0
+
+	@property
+	def t(self) -> np.ndarray:
+		return self._t[:self.n]
+
+	@property
+	def v(self) -> np.ndarray:
+		return self._v[:self.n]
+
+	def append(self, t: float, v: float):
+		"""Append one point that is not older than the last one."""
+		if self.n == len(self._t):
+			self._t = np.resize(self._t, 2 * self.n)
+			self._v = np.resize(self._v, 2 * self.n)
+		self._t[self.n] = t
+		self._v[self.n] = v
+		self.n += 1
+
+	def extend(self, t: np.ndarray, v: np.ndarray) -> bool:
+		"""
+		Append points. Returns True if the new points arrived out of order
+		and the series had to be re-sorted.
+		"""
+		need = self.n + len(t)
+		if need > len(self._t):
+			cap = max(need, 2 * len(self._t))
+			self._t = np.resize(self._t, cap)
+			self._v = np.resize(self._v, cap)
+		resorted = len(t) > 0 and (
+			bool(np.any(np.diff(t) < 0)) or (self.n > 0 and t[0] < self._t[self.n - 1])
+		)
+		self._t[self.n:need] = t
+		self._v[self.n:need] = v
+		self.n = need
+		if resorted:
+			order = np.argsort(self.t, kind="stable")
+			self._t[:self.n] = self.t[order]
+			self._v[:self.n] = self.v[order]
+		return resorted
+
+	def keep_last(self, n: int):
+		"""
+		Drop all but the newest n points. The tail is copied into fresh
+		buffers, so views handed out earlier stay valid.
+		"""
+		if self.n <= n:
+			return
+		cap = max(len(self._t), 1024)
+		t, v = self.t[-n:], self.v[-n:]
+		self._t = np.empty(cap, dtype=np.float64)
+		self._v = np.empty(cap, dtype=np.float64)
+		self._t[:n] = t
+		self._v[:n] = v
+		self.n = n
@@ -0,0 +1,222 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+class FilterStage:
+	"""
+	One step of the streaming pipeline. Stage objects hold only parameters;
+	per-sensor state lives in the object returned by new_state(), so one
+	stage instance serves every channel.
+	"""
+	name = "stage"
+
+	def __init__(self, budget_us: float = 50.0):
+		self.budget_us = budget_us
+
+	def new_state(self):
+		return None
+
+	def step(self, state, ts: float, value: float):
+		"""Return (new_state, value); value None means the sample is rejected."""
+		raise NotImplementedError
+
+
+class GlitchReject(FilterStage):
+	"""Drop DS18B20 power-on readings (85.0 °C) unless the channel is already near 85 °C."""
+	name = "glitch"
+
+	def __init__(self, glitch_values=(85.0,), band: float = 5.0, **kw):
+		super().__init__(**kw)
+		self.glitch_values = tuple(glitch_values)
+		self.band = band
+
+	def new_state(self):
+		return None   # last accepted value
+
+	def step(self, state, ts, value):
+		if value in self.glitch_values and (state is None or abs(value - state) > self.band):
+			return state, None
+		return value, value
+
+
+class MedianSpike(FilterStage):
+	"""Median-of-N spike rejection: samples far from the window median are replaced by it."""
+	name = "median"
+
+	def __init__(self, n: int = 5, threshold: float = 2.0, **kw):
+		super().__init__(**kw)
+		self.n = n
+		self.threshold = threshold
+
+	def new_state(self):
+		return deque(maxlen=self.n)
+
+	def step(self, state, ts, value):
+		state.append(value)
+		med = sorted(state)[len(state) // 2]
+		if len(state) >= 3 and abs(value - med) > self.threshold:
+			return state, med
+		return state, value
+
+
+class RateLimit(FilterStage):
+	"""Clamp the change between outputs to max_rate units per second."""
+	name = "rate_limit"
+
+	def __init__(self, max_rate: float = 1.0, **kw):
+		super().__init__(**kw)
+		self.max_rate = max_rate
+
+	def new_state(self):
+		return None   # (ts, value) of the last output
+
+	def step(self, state, ts, value):
+		if state is not None:
+			last_ts, last = state
+			limit = self.max_rate * max(ts - last_ts, 0.0)
+			value = min(max(value, last - limit), last + limit)
+		return (ts, value), value
+
+
+class EMA(FilterStage):
+	"""Time-aware exponential moving average with time constant tau (s)."""
+	name = "ema"
+
+	def __init__(self, tau: float = 3.0, **kw):
+		super().__init__(**kw)
+		self.tau = tau
+
+	def new_state(self):
+		return None   # (ts, value)
+
+	def step(self, state, ts, value):
+		if state is not None:
+			last_ts, last = state
+			alpha = 1.0 - math.exp(-max(ts - last_ts, 0.0) / self.tau)
+			value = last + alpha * (value - last)
+		return (ts, value), value
+
+
+class Kalman1D(FilterStage):
+	"""
+	Scalar random-walk Kalman filter.
+
+	:param q: Process noise variance per second
+	:param r: Measurement noise variance (0.0625 °C quantization ≈ 0.0003)
+	"""
+	name = "kalman"
+
+	def __init__(self, q: float = 0.01, r: float = 0.0003, **kw):
+		super().__init__(**kw)
+		self.q = q
+		self.r = r
+
+	def new_state(self):
+		return None   # (ts, estimate, variance)
+
+	def step(self, state, ts, value):
+		if state is None:
+			return (ts, value, self.r), value
+		last_ts, x, p = state
+		p += self.q * max(ts - last_ts, 0.0)
+		k = p / (p + self.r)
+		x += k * (value - x)
+		p *= (1.0 - k)
+		return (ts, x, p), x
+
+
+def default_stages() -> List[FilterStage]:
+	return [GlitchReject(), MedianSpike(), RateLimit(), EMA()]
+
+
+class FilterPipeline:
+	def __init__(self, stages: Optional[List[FilterStage]] = None, min_calls: int = 200,
+				 recheck_every: int = 5000):
+		"""
+		Streaming filter chain applied per sensor with O(1) state per channel.
+
+		Each stage's cost is tracked as a moving average; a stage whose average
+		exceeds its budget_us (after min_calls samples) is bypassed so the
+		pipeline keeps up with many channels at high rate. A bypassed stage
+		is re-enabled after recheck_every samples and measured again, so a
+		busy spell doesn't switch it off for good.
+
+		:param stages: Ordered filter stages (defaults to default_stages())
+		:param min_calls: Samples a stage must see before its budget is enforced
+		:param recheck_every: Samples a stage stays bypassed before it is re-measured
+		"""
+		self.stages = stages if stages is not None else default_stages()
+		self.min_calls = min_calls
+		self.recheck_every = recheck_every
+		self._state: Dict[str, list] = {}        # sensor_id -> per-stage states
+		self._last: Dict[str, tuple] = {}        # sensor_id -> (ts, filtered)
+		self._cost_us = [0.0] * len(self.stages)
+		self._calls = [0] * len(self.stages)
+		self._bypassed = [False] * len(self.stages)
+		self._skipped = [0] * len(self.stages)
+		self.lock = threading.Lock()
+
+	def process(self, sensor_id: str, ts: float, value: float) -> Optional[float]:
+		"""Run one sample through the pipeline; returns the filtered value or None if rejected."""
+		states = self._state.get(sensor_id)
+		if states is None:
+			states = self._state[sensor_id] = [s.new_state() for s in self.stages]
+
+		clock: Callable[[], int] = time.perf_counter_ns
+		for i, stage in enumerate(self.stages):
+			if self._bypassed[i]:
+				self._skipped[i] += 1
+				if self._skipped[i] < self.recheck_every:
+					continue
+				# re-measure from scratch; it is bypassed again if still over budget
+				self._bypassed[i] = False
+				self._calls[i] = 0
+				self._cost_us[i] = 0.0
+				print(f"[Filters] re-enabling '{stage.name}' to re-check its cost.")
+			t0 = clock()
+			states[i], value = stage.step(states[i], ts, value)
+			# clip single outliers (GC pauses, thread switches) so only sustained cost counts
+			cost = min((clock() - t0) / 1000.0, 4.0 * stage.budget_us)
+			self._calls[i] += 1
+			self._cost_us[i] += (cost - self._cost_us[i]) * 0.01
+			if self._calls[i] >= self.min_calls and self._cost_us[i] > stage.budget_us:
+				self._bypassed[i] = True
+				self._skipped[i] = 0
+				print(f"[Filters] '{stage.name}' over budget "
+					  f"({self._cost_us[i]:.1f}us > {stage.budget_us:.1f}us), bypassing.")
+			if value is None:
+				return None
+		return value
+
+	def apply(self, sensor_data: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+		"""
+		Return a copy of poller-style data with 'filtered_value' added.
+		Each (sensor, timestamp) reading is filtered once; repeats reuse the result.
+		"""
+		out = {}
+		with self.lock:
+			for sensor_id, info in sensor_data.items():
+				ts = info.get("timestamp")
+				raw = info.get("sensor_value")
+				last = self._last.get(sensor_id)
+				if last is not None and last[0] == ts:
+					filtered = last[1]
+				elif raw is None or ts is None:
+					filtered = None
+				else:
+					filtered = self.process(sensor_id, ts, float(raw))
+					self._last[sensor_id] = (ts, filtered)
+				out[sensor_id] = {**info, "filtered_value": filtered}
+		return out
+
+	def stats(self) -> List[Dict[str, object]]:
+		"""Per-stage average cost, budget and bypass state."""
+		with self.lock:
+			return [
+				{"stage": s.name, "avg_us": round(self._cost_us[i], 2),
+				 "budget_us": s.budget_us, "bypassed": self._bypassed[i]}
+				for i, s in enumerate(self.stages)
+			]
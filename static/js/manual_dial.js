@@ -20,32 +20,27 @@
 	if(inFlight) return false;
 
 	const btn = document.getElementById('saveDialBtn');
-	const input1 = document.getElementById('dial1');
-	const input2 = document.getElementById('dial2');
+	// one input per station, named dial_1, dial_2, ...
+	const inputs = Array.from(document.querySelectorAll('#dialForm input[name^="dial_"]'));
 
-	input1.classList.remove('error');
-	input2.classList.remove('error');
-
-	const v1raw = (input1.value || '').trim();
-	const v2raw = (input2.value || '').trim();
-	const v1 = parseVal(v1raw);
-	const v2 = parseVal(v2raw);
-
-	const v1ok = (v1 === null) || !Number.isNaN(v1);
-	const v2ok = (v2 === null) || !Number.isNaN(v2);
-	if(!v1ok) input1.classList.add('error');
-	if(!v2ok) input2.classList.add('error');
+	const payload = {};
+	let allOk = true;
+	for(const input of inputs){
+	  input.classList.remove('error');
+	  const v = parseVal((input.value || '').trim());
+	  if(v !== null && Number.isNaN(v)){
+		input.classList.add('error');
+		allOk = false;
+	  } else if(v !== null){
+		payload[input.name] = v;
+	  }
+	}
 
-	const provided = (v1 !== null ? 1 : 0) + (v2 !== null ? 1 : 0);
-	if(!v1ok || !v2ok || provided === 0){
+	if(!allOk || Object.keys(payload).length === 0){
 	  showMsg(false, 'Enter a valid number in at least one field');
 	  return false;
 	}
 
-	const payload = {};
-	if(v1 !== null) payload.dial_1 = v1;
-	if(v2 !== null) payload.dial_2 = v2;
-
 	try{
 	  inFlight = true;
 	  btn.disabled = true;
@@ -60,8 +55,7 @@
 	  }
 	  const data = await res.json();
 	  if(data && data.ok){
-		input1.value = '';
-		input2.value = '';
+		inputs.forEach(input => { input.value = ''; });
 		showMsg(true, '✔ Saved');
 		if(typeof window.reloadDialPlot === 'function'){
 		  window.reloadDialPlot();
@@ -0,0 +1,28 @@
+import tempfile
+from logger import DataLogger
+from analysis import HDTAnalyzer
+from sensor_config import sensor_config
+import time
+
+logger = DataLogger(sensor_config, history_dir=tempfile.mkdtemp())
+analyzer = HDTAnalyzer(logger, lambda ts: float(ts))
+
+sensor_config.assign_samples({"sample1": "HDPE"})
+
+logger.start()
+t0 = time.time()
+# 10 minutes at exactly 2 °C/min, dial creeping 0.05 mm/min
+for i in range(601):
+	logger.log({
+		"28-000008ae0bbd": {"sensor_value": 25.0 + i / 30.0, "timestamp": t0 + i},
+		"usb-dial-001": {"sensor_value": 1.0 + i * 0.05 / 60.0, "timestamp": t0 + i},
+	})
+	if i % 100 == 0:
+		analyzer.update()    # incremental: only the new rows are processed
+logger.stop()
+
+result = analyzer.summary({"sample1": "HDPE"})["samples"]["sample1"]
+print("HDT reached:", result["hdt_reached"])                      # Expect: True
+print("HDT temp (°C):", round(result["hdt_temp_c"], 2))            # Expect: 35.0 (crossing at t0+300)
+print("Rate (°C/min):", round(result["heating_rate_c_per_min"], 3))  # Expect: 2.0
+print("Deviations:", result["rate_deviations"])                    # Expect: []
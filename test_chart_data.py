@@ -0,0 +1,49 @@
+# Decimates a 1M-point series with two spikes and checks the window and point budget
+import tempfile
+
+import numpy as np
+
+from chart_data import SeriesIndex, chart_window, decimate_minmax
+from logger import DataLogger
+from sensor_config import sensor_config
+
+N = 1_000_000
+t = 1_700_000_000.0 + np.arange(N) * 0.1
+v = 20.0 + np.sin(np.arange(N) / 5000.0)
+v[123_457] = 85.0      # spike up
+v[654_321] = -10.0     # spike down
+v[500_000] = np.nan    # rejected reading
+
+dt, dv = decimate_minmax(t, v, t[0], t[-1], 800)
+print("Points:", len(dt), "<= 800")                                  # Expect: 800 <= 800
+print("Spikes kept:", 85.0 in dv, -10.0 in dv)                      # Expect: True True
+print("Time ordered:", bool(np.all(np.diff(dt) >= 0)))              # Expect: True
+
+meta = {"sensor_type": "temperature", "sensor_label": "Temp #1", "sensor_units": "°C"}
+out = chart_window([("28-a", meta, t, v)], None, t[-1], 600.0, 400)
+s = out["series"]["28-a"]
+print("Window:", out["end"] - out["start"], "s")                    # Expect: 600.0 s
+print("Inside window:", s["t"][0] >= out["start"] and s["t"][-1] <= out["end"])   # Expect: True
+print("Window points:", len(s["t"]), "<= 400")                       # Expect: 400 <= 400
+
+out = chart_window([("28-a", meta, t, v)], t[499_990], t[500_010], 0, 400)
+print("NaN dropped:", len(out["series"]["28-a"]["t"]), not np.isnan(out["series"]["28-a"]["v"]).any())   # Expect: 20 True
+
+out = chart_window([("28-a", meta, t, v)], None, t[-1], 0, 100_000)
+print("Budget clamp:", out["points"], len(out["series"]["28-a"]["t"]) <= 4000)   # Expect: 4000 True
+
+# No end given: the window ends at the newest sample, not at the wall clock
+out = chart_window([("28-a", meta, t, v)], None, None, 600.0, 400)
+print("Default end:", out["end"] == t[-1], len(out["series"]["28-a"]["t"]) > 0)   # Expect: True True
+
+# Chart windows of a logged run come straight from the run file
+logger = DataLogger(sensor_config, history_dir=tempfile.mkdtemp())
+logger.start()
+for i in range(3600):
+	logger.log({"28-000008ae0bbd": {"sensor_value": 20.0 + i / 100, "timestamp": 1_700_000_000.0 + i}})
+logger.log({"dial_1_manual_entry": {"sensor_value": 1.5, "timestamp": 1_700_000_000.0 + 3000.5}})   # entered late
+index = SeriesIndex(logger)
+out = index.window(None, None, 600.0, 100)
+print("Run window:", out["end"] - out["start"], sorted(out["series"]))   # Expect: 600.0 ['28-000008ae0bbd', 'dial_1_manual_entry']
+print("Run window points:", len(out["series"]["28-000008ae0bbd"]["t"]))   # Expect: 100
+logger.stop()
@@ -0,0 +1,46 @@
+# Writes a 2M-row run to a temp dir, then reads it back through the mmap
+import tempfile
+import time
+
+import numpy as np
+
+from history_store import HistoryStore
+
+N = 2_000_000
+store = HistoryStore(tempfile.mkdtemp())
+store.new_run(1_700_000_000.0)
+
+t0 = time.time()
+ts = 1_700_000_000.0 + np.arange(N) * 0.25
+# a dial read once at the start and never again
+store.append({"timestamp": ts[0] - 1, "sensor_id": "dial_2_manual_entry", "sensor_type": "dial_indicator",
+			  "sensor_label": "Manual Dial 2", "sensor_units": "mm", "sample_id": 0, "sensor_value": 0.0})
+for lo in range(0, N, 100_000):
+	store.extend(
+		{"timestamp": t, "sensor_id": f"28-{i % 4}", "sensor_type": "temperature",
+		 "sensor_label": f"Temp #{i % 4 + 1}", "sensor_units": "°C", "sample_id": 0,
+		 "sensor_value": 20.0 + i * 1e-5, "filtered_value": None}
+		for i, t in zip(range(lo, lo + 100_000), ts[lo:lo + 100_000].tolist())
+	)
+# a manual entry that arrives 30 s late
+store.append({"timestamp": ts[-1] - 30, "sensor_id": "dial_1_manual_entry", "sensor_type": "dial_indicator",
+			  "sensor_label": "Manual Dial 1", "sensor_units": "mm", "sample_id": 0, "sensor_value": 0.25})
+print("Write rows/s:", round(N / (time.time() - t0)))                     # Expect: > 100k
+
+print("Rows:", len(store))                                                # Expect: 2000002
+print("Row 11:", store[11]["timestamp"] == ts[10], store[11]["sensor_id"])  # Expect: True 28-2
+
+t0 = time.time()
+for _ in range(1000):
+	window = store.between(ts[1_000_000], ts[1_000_000] + 60)
+print("Range lookup (us):", round((time.time() - t0) * 1000, 1))         # Expect: well under 1000 (per lookup)
+print("Rows in 60 s window:", len(window))                                # Expect: 241
+
+late = store.between(ts[-1] - 31, ts[-1] - 29)
+print("Late row found:", "dial_1_manual_entry" in [store.sensors[s]["sensor_id"] for s in late["sensor"]])  # Expect: True
+
+t0 = time.time()
+latest = store.latest_per_sensor()
+print("Latest lookup (ms):", round((time.time() - t0) * 1000, 2))        # Expect: < 1 (no scan for the stale dial)
+print("Latest sensors:", sorted(latest))
+# Expect: ['28-0', '28-1', '28-2', '28-3', 'dial_1_manual_entry', 'dial_2_manual_entry']
@@ -0,0 +1,49 @@
+# Runs a hub against local stand-in fixtures (no Pi hardware needed)
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hub import FixtureHub
+
+N_FIXTURES = 20
+
+
+class StandIn(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"   # keep-alive so the hub can reuse connections
+
+	def do_GET(self):
+		now = datetime.now(timezone.utc)
+		body = json.dumps({
+			"28-000008ae0bbd": {"sensor_value": 25.0 + now.second / 10.0, "filtered_value": None,
+								"timestamp": now.isoformat(), "sensor_type": "temperature",
+								"sensor_label": "Temp #1", "sensor_units": "°C", "sample_name": "HDPE"},
+		}).encode("utf-8")
+		self.send_response(200)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args):
+		pass
+
+
+servers = []
+for _ in range(N_FIXTURES):
+	srv = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+	threading.Thread(target=srv.serve_forever, daemon=True).start()
+	servers.append(srv)
+
+hub = FixtureHub({f"fx{i + 1}": f"http://127.0.0.1:{s.server_address[1]}" for i, s in enumerate(servers)})
+hub.start()
+time.sleep(3.5)
+hub.stop()
+
+print("Fixtures OK:", sum(s["ok"] for s in hub.status().values()), "/", N_FIXTURES)   # Expect: 20 / 20
+print("Channels:", len(hub.get_latest_data()))                                        # Expect: 20
+print("Merged rows:", len(hub.get_full_log()))                                         # Expect: ~80 (4 rounds x 20)
+
+for srv in servers:
+	srv.shutdown()
@@ -0,0 +1,49 @@
+# Bulk-imports a v1 (timestamp/sensor_value) file and a new-schema file with overlapping rows
+import csv
+import os
+import tempfile
+import time
+
+from importer import import_into
+from logger import DataLogger
+from manual_logger import NEW_FIELDNAMES
+from run_exporter import RunExporter
+from sensor_config import sensor_config
+
+N = 200_000
+tmp = tempfile.mkdtemp()
+v1_path = os.path.join(tmp, "data_log.v1_20250101_000000.csv")
+new_path = os.path.join(tmp, "log_20250101_000000.csv")
+
+with open(v1_path, "w", newline="", encoding="utf-8") as f:
+	w = csv.writer(f)
+	w.writerow(["timestamp", "sensor_id", "sensor_type", "sensor_label", "sensor_units", "sample_name", "sensor_value"])
+	for i in range(N):
+		w.writerow([1_700_000_000 + i, "28-000008ae0bbd", "temperature", "Temp #1", "°C", "HDPE", 25.0 + i / 1e4])
+
+with open(new_path, "w", newline="", encoding="utf-8") as f:
+	w = csv.writer(f)
+	w.writerow(NEW_FIELDNAMES)
+	for i in range(N // 2, N + N // 2):   # second half overlaps the v1 file
+		w.writerow([f"{1_700_000_000 + i:.6f}", "", "", "28-000008ae0bbd", "temperature", "Temp #1", "°C", "HDPE", 25.0 + i / 1e4])
+
+logger = DataLogger(sensor_config, history_dir=tmp)
+started = time.time()
+result = import_into(logger, [v1_path, new_path])
+elapsed = time.time() - started
+
+print(result["files"])                                   # Expect: v1 and new schema, 200000 rows each
+print("Merged rows:", result["rows"])                    # Expect: 300000 (overlap deduplicated)
+print("Sorted:", all(a["timestamp"] <= b["timestamp"] for a, b in zip(logger.data, logger.data[1:])))  # Expect: True
+first = logger.data[0]
+print("v1 filtered = raw:", first["filtered_value"] == first["sensor_value"])   # Expect: True (v1 files have no filtered column)
+print(f"Rows/minute: {2 * N / elapsed * 60:,.0f}")
+
+# Re-importing a run's own export (ts_epoch rounded to µs) must not duplicate its rows
+run = DataLogger(sensor_config, history_dir=tmp)
+run.start()
+for i in range(100):
+	run.log({"28-000008ae0bbd": {"sensor_value": 25.0 + i / 10, "timestamp": time.time() + i / 3}})
+run.stop()
+export_path = RunExporter(run, float, export_dir=tmp).export()
+print("Re-imported rows:", import_into(run, [export_path])["rows"])   # Expect: 100
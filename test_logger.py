@@ -1,8 +1,9 @@
+import tempfile
 from logger import DataLogger
 from sensor_config import sensor_config
 from datetime import datetime, timezone
 
-logger = DataLogger(sensor_config)
+logger = DataLogger(sensor_config, history_dir=tempfile.mkdtemp())
 
 logger.start()
 logger.log({
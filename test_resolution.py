@@ -0,0 +1,51 @@
+# Fake 1-Wire bus with four probes: idle/logging resolution switching and the read schedule
+import os
+import tempfile
+
+from sensors.temp_reader import TemperatureSensorPoller
+
+GOOD = "72 01 4b 46 7f ff 0e 10 57 : crc=57 YES\n72 01 4b 46 7f ff 0e 10 57 t=23125\n"
+
+base = tempfile.mkdtemp() + "/"
+for i in range(4):
+	os.makedirs(base + f"28-{i}")
+	with open(base + f"28-{i}/resolution", "w") as f:
+		f.write("12")
+	with open(base + f"28-{i}/w1_slave", "w") as f:
+		f.write(GOOD)
+
+
+def bits_on_disk():
+	out = {}
+	for i in range(4):
+		with open(base + f"28-{i}/resolution") as f:
+			out[f"28-{i}"] = int(f.read())
+	return out
+
+
+def slot_sizes():
+	return [len(slot) for slot in poller._slots]
+
+
+# Not started: the poll thread's resolution step is driven by hand
+poller = TemperatureSensorPoller(poll_interval=1.0, idle_resolution=10, base_dir=base)
+poller._apply_resolution(poller.target_resolution)
+print("Idle bits:", set(bits_on_disk().values()))           # Expect: {10}
+print("Idle slots:", slot_sizes())                          # Expect: [4] (4 x 0.1875 s fits in 0.9 s)
+print("Idle period:", {r["period_s"] for r in poller.get_resolution().values()})   # Expect: {1.0}
+
+poller.set_high_resolution(True)
+poller._apply_resolution(poller.target_resolution)
+print("Logging bits:", set(bits_on_disk().values()))        # Expect: {12}
+print("Logging slots:", slot_sizes())                       # Expect: [1, 1, 1, 1] (0.75 s each)
+print("Logging period:", {r["period_s"] for r in poller.get_resolution().values()})   # Expect: {4.0}
+print("Every probe scheduled once:", sorted(p for slot in poller._slots for p in slot) == sorted(poller.sensors))   # Expect: True
+
+poller.set_high_resolution(False)
+poller._apply_resolution(poller.target_resolution)
+print("Back to idle:", set(bits_on_disk().values()), slot_sizes())   # Expect: {10} [4]
+
+# Quarantined probes drop out of the schedule
+poller.health[base + "28-0"].state = "quarantined"
+poller._schedule()
+print("Without quarantined probe:", slot_sizes(), any(base + "28-0" in slot for slot in poller._slots))   # Expect: [3] False
@@ -0,0 +1,25 @@
+import tempfile
+from logger import DataLogger
+from run_exporter import RunExporter
+from sensor_config import sensor_config
+from datetime import datetime, timezone
+
+logger = DataLogger(sensor_config, history_dir=tempfile.mkdtemp())
+exporter = RunExporter(logger, lambda ts: float(ts), export_dir=tempfile.mkdtemp())
+
+logger.start()
+logger.log({"28-000008ae0bbd": {"sensor_value": 22.5, "timestamp": datetime.now(timezone.utc).timestamp()}})
+path = exporter.export()
+print(f"First export: {path} ({exporter.rows_written} rows)")    # Expect: 1 row
+
+logger.log({"28-000008ae5436": {"sensor_value": 23.0, "timestamp": datetime.now(timezone.utc).timestamp()}})
+path = exporter.export()
+print(f"Second export: {path} ({exporter.rows_written} rows)")   # Expect: same file, 2 rows
+
+# more rows than one ITER_CHUNK are written in chunks
+t0 = datetime.now(timezone.utc).timestamp()
+logger.log({f"28-{i}": {"sensor_value": 20.0 + i, "timestamp": t0 + i} for i in range(10_000)})
+path = exporter.export()
+with open(path, encoding="utf-8") as f:
+	print(f"Third export: {sum(1 for _ in f) - 1} rows in file")   # Expect: 10002
+logger.stop()
@@ -0,0 +1,42 @@
+# Fake 1-Wire bus: one good probe, one with a missing w1_slave, one failing CRC
+import os
+import tempfile
+import time
+
+from sensors.temp_reader import TemperatureSensorPoller
+
+GOOD = "72 01 4b 46 7f ff 0e 10 57 : crc=57 YES\n72 01 4b 46 7f ff 0e 10 57 t=23125\n"
+BAD_CRC = "72 01 4b 46 7f ff 0e 10 57 : crc=00 NO\n72 01 4b 46 7f ff 0e 10 57 t=23125\n"
+
+base = tempfile.mkdtemp() + "/"
+for name, body in (("28-good", GOOD), ("28-missing", None), ("28-badcrc", BAD_CRC)):
+	os.makedirs(base + name)
+	with open(base + name + "/resolution", "w") as f:
+		f.write("9")
+	if body is not None:
+		with open(base + name + "/w1_slave", "w") as f:
+			f.write(body)
+
+poller = TemperatureSensorPoller(poll_interval=0.15, idle_resolution=9, base_dir=base)
+poller.start()
+time.sleep(4.0)
+
+health = poller.get_health()
+print("Thread alive:", poller.thread.is_alive())                       # Expect: True
+print("States:", {k: v["state"] for k, v in sorted(health.items())})
+# Expect: {'28-badcrc': 'quarantined', '28-good': 'ok', '28-missing': 'quarantined'}
+print("Good probe reads:", health["28-good"]["reads"])                 # Expect: > 10 (every sweep once the others are quarantined)
+print("Missing probe reads:", health["28-missing"]["reads"])           # Expect: 5
+print("Slots:", [[os.path.basename(p) for p in slot] for slot in poller._slots])   # Expect: [['28-good']]
+
+# Fix the probe and make its quarantine retry due now
+with open(base + "28-missing/w1_slave", "w") as f:
+	f.write(GOOD)
+poller.health[base + "28-missing"].next_attempt = 0.0
+time.sleep(0.2)
+print("Served while quarantined:", "28-missing" in poller.get_data())   # Expect: False
+time.sleep(0.8)
+print("After repair:", poller.get_health()["28-missing"]["state"])    # Expect: ok (reinstated after 3 good reads)
+print("Reading served:", "28-missing" in poller.get_data())            # Expect: True
+
+poller.stop()
@@ -0,0 +1,36 @@
+from signal_filters import FilterPipeline, FilterStage, GlitchReject
+
+pipeline = FilterPipeline()
+
+readings = [25.0, 25.0625, 85.0, 25.125, 31.0, 25.1875, 25.25]   # power-on glitch + spike
+outputs = []
+for i, raw in enumerate(readings):
+	out = pipeline.apply({"28-000008ae0bbd": {"sensor_value": raw, "timestamp": 1000.0 + i}})
+	outputs.append(out["28-000008ae0bbd"]["filtered_value"])
+	print(raw, "->", outputs[-1])
+
+print("Glitch rejected:", outputs[2] is None)                    # Expect: True
+print("Spike suppressed:", outputs[4] < 26.0)                    # Expect: True
+print(pipeline.stats())   # Expect: per-stage avg_us well under budget_us, nothing bypassed
+
+
+class Slow(FilterStage):
+	"""Over budget only while `busy` is set (a busy spell on the Pi)."""
+	name = "slow"
+	busy = True
+
+	def step(self, state, ts, value):
+		if self.busy:
+			sum(range(20000))
+		return state, value
+
+
+slow = Slow(budget_us=50.0)
+pipeline = FilterPipeline([GlitchReject(), slow], min_calls=50, recheck_every=500)
+for i in range(100):
+	pipeline.process("s", float(i), 25.0)
+print("Bypassed when busy:", pipeline.stats()[1]["bypassed"])    # Expect: True
+slow.busy = False
+for i in range(100, 1000):
+	pipeline.process("s", float(i), 25.0)
+print("Re-enabled when idle:", not pipeline.stats()[1]["bypassed"])   # Expect: True
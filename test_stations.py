@@ -0,0 +1,36 @@
+# Three stations from a temporary stations.json
+import json
+import os
+import tempfile
+
+from sensor_config import SensorConfig
+
+path = os.path.join(tempfile.mkdtemp(), "stations.json")
+with open(path, "w", encoding="utf-8") as f:
+	json.dump({"stations": [
+		{"slot": "sample1", "label": "Sample 1", "sensors": ["28-a", "dial-a"], "manual_dial": "dial_1_manual_entry"},
+		{"slot": "sample2", "sensors": ["28-b", "dial-b"], "manual_dial": "dial_2_manual_entry"},
+		{"slot": "sample3", "sensors": ["28-c", "dial-c", "dial_3_manual_entry"], "manual_dial": "dial_3_manual_entry"},
+	]}, f)
+
+cfg = SensorConfig(path)
+print("Slots:", cfg.slots)                                   # Expect: ['sample1', 'sample2', 'sample3']
+print("Default label:", cfg.stations[1]["label"])            # Expect: sample2
+
+cfg.assign_samples({"sample1": "Bar A", "sample2": "Bar B", "sample3": "Bar C"})
+print("Active:", cfg.active_samples())                       # Expect: {'sample1': 'Bar A', 'sample2': 'Bar B', 'sample3': 'Bar C'}
+print("Per sensor:", {sid: cfg.get_sample_name(sid) for sid in ("28-a", "dial-b", "28-c", "dial_3_manual_entry")})
+# Expect: {'28-a': 'Bar A', 'dial-b': 'Bar B', '28-c': 'Bar C', 'dial_3_manual_entry': 'Bar C'}
+print("Same ID per station:", cfg.get_sample_id("28-c") == cfg.get_sample_id("dial-c") == cfg.sample_id_for("Bar C"))   # Expect: True
+print("Unknown sensor:", cfg.get_sample_id("28-zzz"))       # Expect: 0
+
+cfg.assign_samples({"sample2": "Bar D"})
+print("Unlisted cleared:", cfg.active_samples())             # Expect: {'sample1': '', 'sample2': 'Bar D', 'sample3': ''}
+
+cfg.clear_samples()
+print("Cleared:", cfg.active_samples())                      # Expect: {'sample1': '', 'sample2': '', 'sample3': ''}
+print("Cleared IDs:", [cfg.get_sample_id(s) for s in ("28-a", "28-b", "28-c")])   # Expect: [0, 0, 0]
+
+dials = cfg.manual_dials()
+print("dial_3 ->", dials["dial_3"])                          # Expect: dial_3_manual_entry
+print("Manual keys:", sorted(dials))                         # Expect: ['dial_1', 'dial_2', 'dial_3']